@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+CACHE_DB_PATH = os.path.join("database", "api_cache.db")
+
+# Política de TTL: (sufixo do endpoint, até quantos dias de histórico, TTL em segundos).
+# Vale a primeira linha que casar; None em dias casa com qualquer período.
+TTL_POLICY = [
+    ("/simple/price", None, 60),
+    ("/market_chart", 1, 300),
+    ("/market_chart", 7, 1800),
+    ("/market_chart", 30, 3 * 3600),
+    ("/market_chart", None, 6 * 3600),
+    ("/ohlc", 1, 300),
+    ("/ohlc", 7, 1800),
+    ("/ohlc", 30, 3 * 3600),
+    ("/ohlc", None, 6 * 3600),
+]
+DEFAULT_TTL = 300
+
+# Depois desse tempo uma resposta vencida não é mais servida nem enquanto revalida
+MAX_STALE = 24 * 3600
+
+# Limite do cache em memória; a validade é de cada entrada (ver MemoryLRUCache.set)
+MEMORY_MAX_BYTES = 32 * 1024 * 1024
+
+
+def normalize_path(url):
+    """Caminho do endpoint sem host, barra final ou diferença de caixa"""
+    return "/" + urlsplit(url).path.strip("/").lower()
+
+
+def normalize_param(value):
+    """Representação textual estável de um valor de parâmetro"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple, set)):
+        return ",".join(sorted(normalize_param(v) for v in value))
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip().lower()
+    if "," in value:
+        return ",".join(sorted(part.strip() for part in value.split(",") if part.strip()))
+    return value
+
+
+def canonical_key(url, params=None):
+    """Chave de cache independente da ordem e do tipo dos parâmetros"""
+    items = sorted(
+        (str(key).strip().lower(), normalize_param(value))
+        for key, value in (params or {}).items()
+        if value is not None
+    )
+    return f"{normalize_path(url)}?{urlencode(items)}"
+
+
+def history_days(params):
+    """Período (em dias) pedido; 'max' ou ausente conta como ilimitado"""
+    try:
+        return float((params or {}).get("days"))
+    except (TypeError, ValueError):
+        return None
+
+
+def ttl_for(url, params=None):
+    """TTL da resposta segundo a política do endpoint e o período pedido"""
+    path = normalize_path(url)
+    days = history_days(params)
+    for endpoint, max_days, ttl in TTL_POLICY:
+        if not path.endswith(endpoint):
+            continue
+        if max_days is None or (days is not None and days <= max_days):
+            return ttl
+    return DEFAULT_TTL
+
+
+def estimate_size(data):
+    """Tamanho aproximado (bytes) de uma resposta JSON"""
+    return len(json.dumps(data, separators=(",", ":")))
+
+
+class MemoryLRUCache:
+    """Cache LRU em memória limitado por bytes, com expiração preguiçosa em O(1)"""
+
+    def __init__(self, max_bytes=MEMORY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # chave -> (dados, fetched_at, expires_at, tamanho)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, cache_key):
+        """Retorna (dados, momento da busca) ou None"""
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            data, fetched_at, expires_at, size = entry
+            if time.time() > expires_at:
+                self._remove(cache_key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return data, fetched_at
+
+    def set(self, cache_key, data, fetched_at=None, size=None, max_age=MAX_STALE):
+        """Grava uma resposta válida por max_age segundos a partir de fetched_at.
+
+        O padrão é MAX_STALE: o CachedFetcher decide pelo ttl_for se a entrada está
+        fresca ou se é servida vencida enquanto revalida, e precisa dela até lá.
+        """
+        size = size if size is not None else estimate_size(data)
+        if size > self.max_bytes:
+            return
+
+        fetched_at = fetched_at or time.time()
+        with self.lock:
+            if cache_key in self.entries:
+                self._remove(cache_key)
+            self.entries[cache_key] = (data, fetched_at, fetched_at + max_age, size)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                oldest_key = next(iter(self.entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, cache_key):
+        _, _, _, size = self.entries.pop(cache_key)
+        self.total_bytes -= size
+
+    def clear(self):
+        """Esvazia o cache (os contadores são mantidos)"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Contadores de uso do cache"""
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class ResponseCache:
+    """Cache de respostas da API persistido em SQLite"""
+
+    def __init__(self, db_path=CACHE_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS api_cache (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+        self.purge_expired()
+
+    def get(self, cache_key):
+        """Retorna (dados, momento da busca) ou None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, fetched_at FROM api_cache WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, cache_key, url, data, fetched_at=None):
+        """Grava uma resposta no cache"""
+        fetched_at = fetched_at or time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO api_cache (cache_key, url, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (cache_key, url, json.dumps(data), fetched_at),
+            )
+            self.conn.commit()
+
+    def purge_expired(self):
+        """Remove respostas velhas demais para serem servidas"""
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM api_cache WHERE fetched_at < ?",
+                (time.time() - MAX_STALE,),
+            )
+            self.conn.commit()
+
+    def clear(self):
+        """Apaga todo o cache em disco"""
+        with self.lock:
+            self.conn.execute("DELETE FROM api_cache")
+            self.conn.commit()
+
+
+_shared_cache = None
+_shared_memory_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Instância compartilhada do cache, criada no primeiro uso"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = ResponseCache()
+    return _shared_cache
+
+
+def get_memory_cache():
+    """Instância compartilhada do cache em memória"""
+    global _shared_memory_cache
+    if _shared_memory_cache is None:
+        with _shared_lock:
+            if _shared_memory_cache is None:
+                _shared_memory_cache = MemoryLRUCache()
+    return _shared_memory_cache
@@ -1,18 +1,87 @@
-import requests
+import threading
+from urllib.parse import quote, urlencode
+
+from api import http_client
+from api.timeseries import DEFAULT_TIME_RANGE, IncrementalHistory
+
+PATH_PRECO = "/simple/price"
+
+# Limite conservador para o tamanho da URL aceito por proxies e pela API
+MAX_URL_LENGTH = 2000
+
+
+def dividir_ids_por_url(criptos, params_base, max_url_length=MAX_URL_LENGTH):
+    """Agrupa os ids em lotes cuja URL final não passa de max_url_length"""
+    tamanho_base = len(http_client.build_url(PATH_PRECO)) + len("?") + len(urlencode(params_base)) + len("&ids=")
+
+    lotes = []
+    lote_atual = []
+    tamanho_atual = tamanho_base
+    for cripto in criptos:
+        tamanho_id = len(quote(cripto, safe=""))
+        separador = len("%2C") if lote_atual else 0
+
+        if lote_atual and tamanho_atual + separador + tamanho_id > max_url_length:
+            lotes.append(lote_atual)
+            lote_atual = []
+            tamanho_atual = tamanho_base
+            separador = 0
+
+        lote_atual.append(cripto)
+        tamanho_atual += separador + tamanho_id
+
+    if lote_atual:
+        lotes.append(lote_atual)
+    return lotes
+
+
+def buscar_precos_cripto(criptos, vs_currencies="brl,usd", falhas=None, **params_extras):
+    """Busca cotações de várias criptomoedas com o mínimo de requisições.
+
+    Retorna um dict {id: cotação}; ids não encontrados ficam de fora. Se `falhas`
+    for um dict, recebe {id: mensagem de erro} para os ids dos lotes que falharam.
+    """
+    ids = list(dict.fromkeys(c.lower().strip() for c in criptos if c and c.strip()))
+    params_base = {"vs_currencies": vs_currencies, **params_extras}
+
+    cotacoes = {}
+    for lote in dividir_ids_por_url(ids, params_base):
+        params = {"ids": ",".join(lote), **params_base}
+        try:
+            cotacoes.update(http_client.get_json(PATH_PRECO, params=params))
+        except Exception as e:
+            print("Erro na API:", e)
+            if falhas is not None:
+                falhas.update(dict.fromkeys(lote, str(e) or type(e).__name__))
+    return cotacoes
+
 
 def buscar_preco_cripto(cripto):
+    return buscar_precos_cripto([cripto]).get(cripto.lower().strip())
+
+
+_historico = None
+_historico_lock = threading.Lock()
+
+
+def historico_incremental():
+    """IncrementalHistory compartilhado, gravando no mesmo SQLite de séries do app.
+
+    Erros da API são propagados (em vez de virarem um histórico vazio) para que
+    quem chamou possa reportá-los.
+    """
+    global _historico
+    if _historico is None:
+        with _historico_lock:
+            if _historico is None:
+                _historico = IncrementalHistory(http_client.get_json)
+    return _historico
+
+
+def buscar_historico(cripto, periodo=DEFAULT_TIME_RANGE, vs_currency="usd", candles=False):
+    """Buckets (bucket_ts, last_ts, o, h, l, c, volume, market cap) do período.
 
-    
-    url = f"https://api.coingecko.com/api/v3/simple/price"
-    params = {
-        "ids": cripto,
-        "vs_currencies": "brl,usd"
-    }
-
-    try:
-        resposta = requests.get(url, params=params)
-        data = resposta.json()
-        return data.get(cripto)
-    except Exception as e:
-        print("Erro na API:", e)
-        return None
+    Só o trecho que ainda não está salvo localmente é buscado na API; falhas dela
+    levantam a exceção do http_client.
+    """
+    return historico_incremental().range_buckets(cripto.lower().strip(), periodo, vs_currency, candles)
@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from api import http_client
+from api.cache import MAX_STALE, canonical_key, get_memory_cache, get_response_cache, ttl_for
+from api.http_client import DEFAULT_MAX_RETRIES
+from api.singleflight import SingleFlight
+
+
+class CachedFetcher:
+    """Requisições com cache em memória e em disco, stale-while-revalidate e single-flight"""
+
+    def __init__(self, memory_cache=None, response_cache=None, revalidate_workers=2):
+        self.cache = memory_cache or get_memory_cache()
+        self.response_cache = response_cache or get_response_cache()
+        self.in_flight = SingleFlight()
+        self.revalidating = set()
+        self.revalidate_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=revalidate_workers, thread_name_prefix="revalidate")
+
+    def request(self, url, params=None, max_retries=DEFAULT_MAX_RETRIES, use_cache=True):
+        """JSON da resposta (do cache quando possível) ou None em caso de falha"""
+        cache_key = canonical_key(url, params)
+
+        if not use_cache:
+            return self.in_flight.do(cache_key, self.fetch_from_api, url, params, max_retries)
+
+        current_time = time.time()
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            entry = self.response_cache.get(cache_key)
+            if entry:
+                self.cache.set(cache_key, *entry)
+        if entry:
+            cached_data, cache_time = entry
+            age = current_time - cache_time
+            if age < ttl_for(url, params):
+                return cached_data
+            if age < MAX_STALE:
+                # Serve o dado vencido na hora e atualiza em segundo plano
+                self.revalidate(cache_key, url, params, max_retries)
+                return cached_data
+
+        # Chamadas simultâneas para a mesma chave compartilham uma única requisição
+        return self.in_flight.do(cache_key, self.fetch_and_store, cache_key, url, params, max_retries)
+
+    def fetch_and_store(self, cache_key, url, params, max_retries):
+        """Busca na API e grava a resposta nos caches em memória e em disco"""
+        # Outra chamada pode ter preenchido o cache enquanto esta esperava
+        entry = self.cache.get(cache_key)
+        if entry and time.time() - entry[1] < ttl_for(url, params):
+            return entry[0]
+
+        data = self.fetch_from_api(url, params, max_retries)
+        if data is not None:
+            fetched_at = time.time()
+            self.cache.set(cache_key, data, fetched_at)
+            try:
+                self.response_cache.set(cache_key, url, data, fetched_at)
+            except Exception as e:
+                print(f"Erro ao gravar cache em disco: {e}")
+        return data
+
+    def revalidate(self, cache_key, url, params, max_retries):
+        """Atualiza uma entrada vencida do cache sem bloquear quem pediu"""
+        with self.revalidate_lock:
+            if cache_key in self.revalidating:
+                return
+            self.revalidating.add(cache_key)
+
+        def refresh():
+            try:
+                self.in_flight.do(cache_key, self.fetch_and_store, cache_key, url, params, max_retries)
+            finally:
+                with self.revalidate_lock:
+                    self.revalidating.discard(cache_key)
+
+        try:
+            self.executor.submit(refresh)
+        except RuntimeError:
+            # Executor já encerrado
+            with self.revalidate_lock:
+                self.revalidating.discard(cache_key)
+
+    def fetch_from_api(self, url, params=None, max_retries=DEFAULT_MAX_RETRIES):
+        """Requisição HTTP dentro do orçamento de taxa compartilhado"""
+        try:
+            return http_client.get_json(url, params=params, max_retries=max_retries)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Todas as tentativas falharam para {url}: {e}")
+            return None
+
+    def clear(self):
+        """Esvazia os caches em memória e em disco"""
+        self.cache.clear()
+        self.response_cache.clear()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def get_cached_fetcher():
+    """Instância compartilhada do pipeline de requisições"""
+    global _shared_fetcher
+    if _shared_fetcher is None:
+        with _shared_lock:
+            if _shared_fetcher is None:
+                _shared_fetcher = CachedFetcher()
+    return _shared_fetcher
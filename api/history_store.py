@@ -0,0 +1,273 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+HISTORY_DB_PATH = os.path.join("database", "crypto_history.db")
+
+# Gravações acumuladas numa única transação
+WRITE_BATCH_SIZE = 500
+
+# Espera (s) por mais gravações antes de fechar o lote
+WRITE_BATCH_WAIT = 0.05
+
+_STOP = object()
+
+
+def utc_timestamp():
+    """Data/hora UTC no mesmo formato do CURRENT_TIMESTAMP do SQLite"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SearchHistoryStore:
+    """Histórico de buscas em SQLite (WAL), com gravações em lote numa thread de fundo"""
+
+    def __init__(self, db_path=HISTORY_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = self._connect()
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS search_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                crypto_name TEXT NOT NULL,
+                search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                price_usd REAL,
+                price_brl REAL,
+                change_24h REAL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_search_history_date
+                ON search_history (search_date);
+
+            CREATE INDEX IF NOT EXISTS idx_search_history_crypto_date
+                ON search_history (crypto_name, search_date);
+
+            CREATE TABLE IF NOT EXISTS search_daily_stats (
+                crypto_name TEXT NOT NULL,
+                day TEXT NOT NULL,
+                searches INTEGER NOT NULL,
+                priced INTEGER NOT NULL,
+                min_usd REAL,
+                max_usd REAL,
+                sum_usd REAL NOT NULL,
+                last_usd REAL,
+                last_brl REAL,
+                last_date TEXT NOT NULL,
+                PRIMARY KEY (crypto_name, day)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_search_daily_stats_day
+                ON search_daily_stats (day);
+
+            CREATE TABLE IF NOT EXISTS search_coin_stats (
+                crypto_name TEXT PRIMARY KEY,
+                searches INTEGER NOT NULL,
+                first_date TEXT NOT NULL,
+                last_date TEXT NOT NULL,
+                last_usd REAL
+            ) WITHOUT ROWID;
+        ''')
+        self.conn.commit()
+        self.backfill_rollups()
+
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Em WAL, NORMAL só sincroniza no checkpoint e continua seguro contra corrupção
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, crypto_name, price_usd, price_brl, change_24h):
+        """Enfileira uma busca; a gravação acontece na thread de fundo"""
+        self.pending.put((crypto_name, utc_timestamp(), price_usd, price_brl, change_24h))
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self.pending.get()
+            batch = [] if item is _STOP else [item]
+            stop = item is _STOP
+
+            while not stop and len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self.pending.get(timeout=WRITE_BATCH_WAIT)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                try:
+                    with conn:
+                        self._write_batch(conn, batch)
+                except sqlite3.Error as e:
+                    print(f"Erro ao salvar histórico: {e}")
+
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self.pending.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def _write_batch(self, conn, batch):
+        conn.executemany('''
+            INSERT INTO search_history (crypto_name, search_date, price_usd, price_brl, change_24h)
+            VALUES (?, ?, ?, ?, ?)
+        ''', batch)
+        self._update_rollups(conn, batch)
+
+    def _update_rollups(self, conn, rows):
+        """Soma as buscas (crypto_name, search_date, usd, brl, ...) aos resumos, na mesma transação"""
+        # Preço zero ou ausente conta como busca, mas não entra em mínimo/máximo/média
+        daily = [
+            (name, date[:10], 1 if usd else 0, usd or None, usd or None, usd or 0, usd or None, brl or None, date)
+            for name, date, usd, brl, *_ in rows
+        ]
+        conn.executemany('''
+            INSERT INTO search_daily_stats (
+                crypto_name, day, searches, priced, min_usd, max_usd, sum_usd, last_usd, last_brl, last_date
+            ) VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (crypto_name, day) DO UPDATE SET
+                searches = searches + 1,
+                priced = priced + excluded.priced,
+                min_usd = COALESCE(MIN(min_usd, excluded.min_usd), min_usd, excluded.min_usd),
+                max_usd = COALESCE(MAX(max_usd, excluded.max_usd), max_usd, excluded.max_usd),
+                sum_usd = sum_usd + excluded.sum_usd,
+                last_usd = CASE WHEN excluded.last_date >= last_date
+                    THEN COALESCE(excluded.last_usd, last_usd) ELSE last_usd END,
+                last_brl = CASE WHEN excluded.last_date >= last_date
+                    THEN COALESCE(excluded.last_brl, last_brl) ELSE last_brl END,
+                last_date = MAX(last_date, excluded.last_date)
+        ''', daily)
+        conn.executemany('''
+            INSERT INTO search_coin_stats (crypto_name, searches, first_date, last_date, last_usd)
+            VALUES (?, 1, ?, ?, ?)
+            ON CONFLICT (crypto_name) DO UPDATE SET
+                searches = searches + 1,
+                first_date = MIN(first_date, excluded.first_date),
+                last_usd = CASE WHEN excluded.last_date >= last_date
+                    THEN COALESCE(excluded.last_usd, last_usd) ELSE last_usd END,
+                last_date = MAX(last_date, excluded.last_date)
+        ''', [(name, date, date, usd or None) for name, date, usd, *_ in rows])
+
+    def backfill_rollups(self):
+        """Gera os resumos para buscas gravadas antes de eles existirem"""
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM search_coin_stats LIMIT 1").fetchone():
+                return
+            if not self.conn.execute("SELECT 1 FROM search_history LIMIT 1").fetchone():
+                return
+            cursor = self.conn.execute('''
+                SELECT crypto_name, search_date, price_usd, price_brl, change_24h
+                FROM search_history ORDER BY search_date, id
+            ''')
+            with self.conn:
+                while True:
+                    rows = cursor.fetchmany(WRITE_BATCH_SIZE * 10)
+                    if not rows:
+                        break
+                    self._update_rollups(self.conn, rows)
+
+    def daily_stats(self, crypto_name=None, days=30):
+        """Resumo diário (UTC) por moeda: (cripto, dia, buscas, mín, máx, média, último USD)"""
+        self.flush()
+        conditions = ["day >= date('now', ?)"]
+        params = [f"-{int(days) - 1} days"]
+        if crypto_name:
+            conditions.append("crypto_name = ?")
+            params.append(crypto_name)
+        with self.lock:
+            return self.conn.execute(f'''
+                SELECT crypto_name, day, searches, min_usd, max_usd,
+                       CASE WHEN priced > 0 THEN sum_usd / priced END, last_usd
+                FROM search_daily_stats
+                WHERE {' AND '.join(conditions)}
+                ORDER BY day DESC, searches DESC, crypto_name
+            ''', params).fetchall()
+
+    def coin_stats(self):
+        """Totais por moeda: (cripto, buscas, primeira busca, última busca, último USD)"""
+        self.flush()
+        with self.lock:
+            return self.conn.execute('''
+                SELECT crypto_name, searches, first_date, last_date, last_usd
+                FROM search_coin_stats
+                ORDER BY searches DESC, crypto_name
+            ''').fetchall()
+
+    def flush(self):
+        """Espera as gravações pendentes chegarem ao banco"""
+        if self.writer.is_alive():
+            self.pending.join()
+
+    def page(self, crypto_name=None, before=None, after=None, limit=200):
+        """Página do histórico, da busca mais nova para a mais antiga (paginação por chave).
+
+        `before`/`after` são chaves (search_date, id): a página traz as buscas mais
+        antigas que `before` ou as imediatamente mais novas que `after`. Cada linha é
+        (id, crypto_name, search_date, price_usd, price_brl, change_24h).
+        """
+        self.flush()
+        conditions, params = [], []
+        if crypto_name:
+            conditions.append("crypto_name = ?")
+            params.append(crypto_name)
+        if before is not None:
+            conditions.append("(search_date, id) < (?, ?)")
+            params.extend(before)
+        if after is not None:
+            conditions.append("(search_date, id) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "ASC" if after is not None else "DESC"
+
+        with self.lock:
+            rows = self.conn.execute(f'''
+                SELECT id, crypto_name, search_date, price_usd, price_brl, change_24h
+                FROM search_history
+                {where}
+                ORDER BY search_date {order}, id {order}
+                LIMIT ?
+            ''', (*params, limit)).fetchall()
+        return rows[::-1] if after is not None else rows
+
+    def coins(self, limit=500):
+        """Moedas já buscadas, em ordem alfabética (lidas do resumo por moeda)"""
+        self.flush()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT crypto_name FROM search_coin_stats ORDER BY crypto_name LIMIT ?", (limit,)
+            ).fetchall()
+        return [name for name, in rows]
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread de fundo"""
+        if self.writer.is_alive():
+            self.pending.put(_STOP)
+            self.writer.join()
+        with self.lock:
+            self.conn.close()
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_history_store():
+    """Instância compartilhada do histórico; o que estiver pendente é gravado na saída"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_lock:
+            if _shared_store is None:
+                _shared_store = SearchHistoryStore()
+                atexit.register(_shared_store.close)
+    return _shared_store
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.rate_limiter import backoff_delay, parse_retry_after, rate_limiter
+
+DEFAULT_BASE_URL = "https://api.coingecko.com/api/v3"
+
+# (conexão, leitura) em segundos
+DEFAULT_TIMEOUT = (3.05, 8)
+
+POOL_SIZE = 10
+
+DEFAULT_MAX_RETRIES = 4
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Retry-After maior que isso é tratado como falha em vez de espera
+MAX_RETRY_AFTER = 60
+
+_base_url = os.environ.get("COINGECKO_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_base_url():
+    """Retorna a URL base usada por todas as requisições"""
+    return _base_url
+
+
+def set_base_url(url):
+    """Troca a URL base (ex.: um servidor local ou proxy da CoinGecko)"""
+    global _base_url
+    _base_url = (url or DEFAULT_BASE_URL).rstrip("/")
+
+
+def build_url(path):
+    """Monta a URL completa; URLs absolutas são mantidas como estão"""
+    if path.startswith(("http://", "https://")):
+        return path
+    return f"{_base_url}/{path.lstrip('/')}"
+
+
+def get_session():
+    """Sessão compartilhada com pool de conexões keep-alive"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Accept": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                    "User-Agent": "CryptoApp/1.0",
+                })
+                _session = session
+    return _session
+
+
+def get(path, params=None, timeout=None):
+    """GET usando a sessão compartilhada e o timeout padrão"""
+    return get_session().get(
+        build_url(path),
+        params=params,
+        timeout=timeout or DEFAULT_TIMEOUT,
+    )
+
+
+def get_json(path, params=None, timeout=None, max_retries=DEFAULT_MAX_RETRIES, limiter=rate_limiter):
+    """GET dentro do limite de taxa, com backoff e respeito ao Retry-After; retorna o JSON"""
+    for attempt in range(max_retries):
+        last_attempt = attempt == max_retries - 1
+        limiter.acquire()
+
+        try:
+            response = get(path, params=params, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if last_attempt:
+                raise
+            print(f"Tentativa {attempt + 1} falhou: {e}")
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if response.status_code in RETRYABLE_STATUS and not last_attempt:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            print(f"Tentativa {attempt + 1} falhou: HTTP {response.status_code}")
+            if response.status_code == 429:
+                delay = retry_after if retry_after is not None else 1 + backoff_delay(attempt, base=2)
+                if delay > MAX_RETRY_AFTER:
+                    response.raise_for_status()
+                # Todas as threads esperam, não só a que recebeu o 429
+                limiter.block_for(delay)
+            else:
+                time.sleep(retry_after if retry_after is not None else backoff_delay(attempt))
+            continue
+
+        response.raise_for_status()
+        return response.json()
+
+
+def close():
+    """Fecha as conexões abertas da sessão compartilhada"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,107 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Limite da API pública da CoinGecko (varia entre 10 e 30 req/min)
+DEFAULT_PER_MINUTE = int(os.environ.get("COINGECKO_RATE_PER_MINUTE", "30"))
+DEFAULT_BURST = 5
+
+
+class TokenBucket:
+    """Limitador de taxa por token bucket, seguro entre threads"""
+
+    def __init__(self, per_minute=DEFAULT_PER_MINUTE, burst=DEFAULT_BURST):
+        self.lock = threading.Lock()
+        self.per_minute = max(1, per_minute)
+        self.rate = self.per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def configure(self, per_minute=None, burst=None):
+        """Altera o orçamento por minuto e/ou o tamanho da rajada"""
+        with self.lock:
+            self._refill(time.monotonic())
+            if per_minute is not None:
+                self.per_minute = max(1, per_minute)
+                self.rate = self.per_minute / 60.0
+            if burst is not None:
+                self.capacity = max(1, burst)
+                self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def acquire(self, timeout=None):
+        """Espera até haver um token disponível; retorna False se estourar o timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def block_for(self, seconds):
+        """Suspende todas as requisições (ex.: após um HTTP 429 com Retry-After)"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def remaining(self):
+        """Requisições que podem ser feitas agora sem esperar"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.blocked_until:
+                return 0
+            return int(self.tokens)
+
+    def wait_time(self):
+        """Segundos até a próxima requisição ser liberada"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= 1:
+                return max(0.0, self.blocked_until - now)
+            return max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Backoff exponencial com jitter completo"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value):
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+rate_limiter = TokenBucket()
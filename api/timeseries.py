@@ -0,0 +1,386 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+
+MARKET_DB_PATH = os.path.join("database", "market_data.db")
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+# Idade máxima (s) do último ponto local antes de buscar o trecho que falta
+TAIL_MAX_AGE = 300
+
+# Valores de "days" aceitos pelo endpoint /ohlc da API pública
+OHLC_DAYS = (1, 7, 14, 30, 90, 180, 365)
+
+# /market_chart/range devolve pontos horários para intervalos de até 90 dias
+MAX_RANGE_GAP_DAYS = 90
+
+# Passos (s) de arredondamento de from/to em /market_chart/range: clientes com
+# coberturas ligeiramente diferentes caem na mesma chave de cache
+RANGE_FROM_STEP = 3600
+RANGE_TO_STEP = 60
+
+# Níveis pré-agregados mantidos a cada gravação (nome -> largura do bucket em ms)
+PYRAMID_LEVELS = {
+    "5m": 5 * MINUTE_MS,
+    "1h": HOUR_MS,
+    "4h": 4 * HOUR_MS,
+    "1d": DAY_MS,
+    "1w": 7 * DAY_MS,
+}
+
+# Período -> (days pedido à API, nível da linha/volume, nível dos candles)
+TIME_RANGES = {
+    "1d": (1, "5m", "1h"),
+    "7d": (7, "1h", "4h"),
+    "30d": (30, "1h", "4h"),
+    "90d": (90, "1h", "1d"),
+    "1y": (365, "1d", "1w"),
+    "max": ("max", "1d", "1w"),
+}
+DEFAULT_TIME_RANGE = "30d"
+
+
+def period_ms(days):
+    """Duração do período em ms; None para "max" (desde o início da série)"""
+    return None if days == "max" else int(days * DAY_MS)
+
+
+def ohlc_resolution_ms(days):
+    """Granularidade dos candles que a CoinGecko devolve para um período"""
+    if days == "max":
+        return 4 * DAY_MS
+    if days <= 2:
+        return 30 * MINUTE_MS
+    if days <= 30:
+        return 4 * HOUR_MS
+    return 4 * DAY_MS
+
+
+def range_window(from_s, to_s):
+    """(from, to) em segundos alinhados: from para baixo na hora, to para cima no minuto"""
+    from_s = int(from_s) // RANGE_FROM_STEP * RANGE_FROM_STEP
+    to_s = -(-int(to_s) // RANGE_TO_STEP) * RANGE_TO_STEP
+    return from_s, to_s
+
+
+def market_chart_tier(days):
+    """Granularidade dos pontos de /market_chart para um período"""
+    if days == "max" or days > MAX_RANGE_GAP_DAYS:
+        return "1d"
+    if days <= 1:
+        return "5m"
+    return "1h"
+
+
+def pyramid_rows_from_points(rows):
+    """Buckets de cada nível a partir de pontos (ts, preço, market cap, volume) ordenados"""
+    buckets = {}
+    for ts, price, market_cap, volume in rows:
+        if price is None:
+            continue
+        for resolution in PYRAMID_LEVELS.values():
+            key = (resolution, ts // resolution * resolution)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [ts, ts, price, price, price, price, volume, market_cap]
+                continue
+            bucket[1] = ts
+            bucket[3] = max(bucket[3], price)
+            bucket[4] = min(bucket[4], price)
+            bucket[5] = price
+            if volume is not None:
+                bucket[6] = volume
+            if market_cap is not None:
+                bucket[7] = market_cap
+    return [(resolution, bucket_ts, *bucket) for (resolution, bucket_ts), bucket in buckets.items()]
+
+
+def pyramid_rows_from_candles(candles, candle_resolution):
+    """Buckets dos níveis que comportam candles [ts de fechamento, o, h, l, c]"""
+    buckets = {}
+    for ts, open_price, high, low, close in sorted(candles):
+        open_ts = ts - candle_resolution
+        for resolution in PYRAMID_LEVELS.values():
+            if resolution < candle_resolution:
+                continue
+            key = (resolution, open_ts // resolution * resolution)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [open_ts, ts, open_price, high, low, close, None, None]
+                continue
+            bucket[1] = ts
+            bucket[3] = max(bucket[3], high)
+            bucket[4] = min(bucket[4], low)
+            bucket[5] = close
+    return [(resolution, bucket_ts, *bucket) for (resolution, bucket_ts), bucket in buckets.items()]
+
+
+class TimeSeriesStore:
+    """Séries históricas de preço e OHLC salvas localmente em SQLite"""
+
+    def __init__(self, db_path=MARKET_DB_PATH):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS price_points (
+                coin_id TEXT NOT NULL,
+                vs_currency TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                price REAL,
+                market_cap REAL,
+                volume REAL,
+                PRIMARY KEY (coin_id, vs_currency, ts)
+            ) WITHOUT ROWID;
+
+            -- Candles brutos de /ohlc de versões antigas: hoje só a pirâmide é lida
+            DROP TABLE IF EXISTS ohlc_candles;
+
+            CREATE TABLE IF NOT EXISTS ohlc_pyramid (
+                coin_id TEXT NOT NULL,
+                vs_currency TEXT NOT NULL,
+                resolution INTEGER NOT NULL,
+                bucket_ts INTEGER NOT NULL,
+                first_ts INTEGER NOT NULL,
+                last_ts INTEGER NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                market_cap REAL,
+                PRIMARY KEY (coin_id, vs_currency, resolution, bucket_ts)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS series_coverage (
+                coin_id TEXT NOT NULL,
+                vs_currency TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                start_ts INTEGER NOT NULL,
+                end_ts INTEGER NOT NULL,
+                PRIMARY KEY (coin_id, vs_currency, kind)
+            ) WITHOUT ROWID;
+        ''')
+        self.conn.commit()
+        self.backfill_pyramid()
+
+    def backfill_pyramid(self):
+        """Gera a pirâmide para pontos gravados antes de ela existir"""
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM ohlc_pyramid LIMIT 1").fetchone():
+                return
+            series = self.conn.execute("SELECT DISTINCT coin_id, vs_currency FROM price_points").fetchall()
+
+        for coin_id, vs_currency in series:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT ts, price, market_cap, volume FROM price_points WHERE coin_id = ? AND vs_currency = ? ORDER BY ts",
+                    (coin_id, vs_currency),
+                ).fetchall()
+            self.merge_pyramid(coin_id, vs_currency, pyramid_rows_from_points(rows))
+
+    def merge_pyramid(self, coin_id, vs_currency, rows):
+        """Mescla buckets na pirâmide: abertura/fechamento pelo tempo, máxima/mínima acumuladas"""
+        with self.lock:
+            self.conn.executemany('''
+                INSERT INTO ohlc_pyramid (
+                    coin_id, vs_currency, resolution, bucket_ts, first_ts, last_ts,
+                    open, high, low, close, volume, market_cap
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (coin_id, vs_currency, resolution, bucket_ts) DO UPDATE SET
+                    open = CASE WHEN excluded.first_ts < first_ts THEN excluded.open ELSE open END,
+                    close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close ELSE close END,
+                    high = MAX(high, excluded.high),
+                    low = MIN(low, excluded.low),
+                    volume = CASE WHEN excluded.last_ts >= last_ts
+                        THEN COALESCE(excluded.volume, volume) ELSE COALESCE(volume, excluded.volume) END,
+                    market_cap = CASE WHEN excluded.last_ts >= last_ts
+                        THEN COALESCE(excluded.market_cap, market_cap) ELSE COALESCE(market_cap, excluded.market_cap) END,
+                    first_ts = MIN(first_ts, excluded.first_ts),
+                    last_ts = MAX(last_ts, excluded.last_ts)
+            ''', [(coin_id, vs_currency, *row) for row in rows])
+            self.conn.commit()
+
+    def read_pyramid(self, coin_id, vs_currency, level, start_ts, end_ts):
+        """Buckets (bucket_ts, last_ts, o, h, l, c, volume, market cap) de um nível"""
+        with self.lock:
+            return self.conn.execute('''
+                SELECT bucket_ts, last_ts, open, high, low, close, volume, market_cap
+                FROM ohlc_pyramid
+                WHERE coin_id = ? AND vs_currency = ? AND resolution = ? AND bucket_ts BETWEEN ? AND ?
+                ORDER BY bucket_ts
+            ''', (coin_id, vs_currency, PYRAMID_LEVELS[level], int(start_ts), int(end_ts))).fetchall()
+
+    def get_coverage(self, coin_id, vs_currency, kind):
+        """Intervalo (start_ts, end_ts) em ms já salvo para a série, ou None"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT start_ts, end_ts FROM series_coverage WHERE coin_id = ? AND vs_currency = ? AND kind = ?",
+                (coin_id, vs_currency, kind),
+            ).fetchone()
+
+    def set_coverage(self, coin_id, vs_currency, kind, start_ts, end_ts):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO series_coverage (coin_id, vs_currency, kind, start_ts, end_ts) VALUES (?, ?, ?, ?, ?)",
+                (coin_id, vs_currency, kind, int(start_ts), int(end_ts)),
+            )
+            self.conn.commit()
+
+    def upsert_market_chart(self, coin_id, vs_currency, data):
+        """Mescla a resposta de /market_chart (ou /range) na série local"""
+        rows = {}
+        for column, key in ((0, "prices"), (1, "market_caps"), (2, "total_volumes")):
+            for ts, value in data.get(key) or []:
+                rows.setdefault(int(ts), [None, None, None])[column] = value
+
+        with self.lock:
+            self.conn.executemany('''
+                INSERT INTO price_points (coin_id, vs_currency, ts, price, market_cap, volume)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (coin_id, vs_currency, ts) DO UPDATE SET
+                    price = COALESCE(excluded.price, price),
+                    market_cap = COALESCE(excluded.market_cap, market_cap),
+                    volume = COALESCE(excluded.volume, volume)
+            ''', [(coin_id, vs_currency, ts, *values) for ts, values in rows.items()])
+            self.conn.commit()
+
+        points = sorted((ts, *values) for ts, values in rows.items())
+        self.merge_pyramid(coin_id, vs_currency, pyramid_rows_from_points(points))
+        return len(rows)
+
+    def upsert_ohlc(self, coin_id, vs_currency, resolution, candles):
+        """Mescla candles [ts, o, h, l, c] de uma granularidade na pirâmide"""
+        self.merge_pyramid(coin_id, vs_currency, pyramid_rows_from_candles(candles, int(resolution)))
+        return len(candles)
+
+    def clear(self):
+        """Apaga todas as séries locais"""
+        with self.lock:
+            self.conn.executescript('''
+                DELETE FROM price_points;
+                DELETE FROM ohlc_pyramid;
+                DELETE FROM series_coverage;
+            ''')
+            self.conn.commit()
+
+
+class IncrementalHistory:
+    """Mantém as séries locais em dia buscando na API só o trecho que falta.
+
+    `request(path, params)` deve devolver o JSON da resposta ou None; exceções dele
+    são propagadas a quem chamou.
+    """
+
+    def __init__(self, request, store=None):
+        self.request = request
+        self.store = store or get_timeseries_store()
+
+    @staticmethod
+    def _window(days):
+        """(início, agora) em ms do período; "max" começa no início da série"""
+        now_ms = int(time.time() * 1000)
+        length = period_ms(days)
+        return (0 if length is None else now_ms - length), now_ms
+
+    def sync_market_chart(self, coin_id, days=30, vs_currency="usd"):
+        """Garante os pontos de /market_chart do período na série local"""
+        start_ms, now_ms = self._window(days)
+        tier = market_chart_tier(days)
+        kind = f"market_chart_{tier}"
+        coverage = self.store.get_coverage(coin_id, vs_currency, kind)
+        covered = coverage is not None and coverage[0] <= start_ms + PYRAMID_LEVELS[tier]
+        gap_ms = now_ms - coverage[1] if coverage else None
+        length = period_ms(days)
+
+        if covered and gap_ms < TAIL_MAX_AGE * 1000:
+            pass
+        elif covered and gap_ms <= MAX_RANGE_GAP_DAYS * DAY_MS and (length is None or gap_ms <= length):
+            from_s, to_s = range_window(coverage[1] // 1000, now_ms // 1000)
+            data = self.request(
+                f"/coins/{coin_id}/market_chart/range",
+                {"vs_currency": vs_currency, "from": from_s, "to": to_s},
+            )
+            if data:
+                self.store.upsert_market_chart(coin_id, vs_currency, data)
+                self.store.set_coverage(coin_id, vs_currency, kind, coverage[0], now_ms)
+        else:
+            data = self.request(
+                f"/coins/{coin_id}/market_chart",
+                {"vs_currency": vs_currency, "days": days},
+            )
+            if data and data.get("prices"):
+                self.store.upsert_market_chart(coin_id, vs_currency, data)
+                first_ts = 0 if days == "max" else data["prices"][0][0]
+                if coverage is not None and coverage[1] >= first_ts:
+                    first_ts = min(first_ts, coverage[0])
+                self.store.set_coverage(coin_id, vs_currency, kind, first_ts, now_ms)
+        return start_ms, now_ms
+
+    def sync_ohlc(self, coin_id, days=30, vs_currency="usd"):
+        """Garante os candles de /ohlc do período na série local"""
+        start_ms, now_ms = self._window(days)
+        resolution = ohlc_resolution_ms(days)
+        kind = f"ohlc_{resolution}"
+        coverage = self.store.get_coverage(coin_id, vs_currency, kind)
+        covered = coverage is not None and coverage[0] <= start_ms + resolution
+        gap_days = math.ceil((now_ms - coverage[1]) / DAY_MS) if coverage else None
+
+        if covered and now_ms - coverage[1] < TAIL_MAX_AGE * 1000:
+            pass
+        elif covered and (days == "max" or gap_days <= days):
+            # Período menor => candles mais finos, agregados na leitura
+            tail_days = next((d for d in OHLC_DAYS if d >= gap_days), days)
+            candles = self.request(
+                f"/coins/{coin_id}/ohlc",
+                {"vs_currency": vs_currency, "days": tail_days},
+            )
+            if candles:
+                self.store.upsert_ohlc(coin_id, vs_currency, ohlc_resolution_ms(tail_days), candles)
+                self.store.set_coverage(coin_id, vs_currency, kind, coverage[0], now_ms)
+        else:
+            candles = self.request(
+                f"/coins/{coin_id}/ohlc",
+                {"vs_currency": vs_currency, "days": days},
+            )
+            if candles:
+                self.store.upsert_ohlc(coin_id, vs_currency, resolution, candles)
+                first_ts = 0 if days == "max" else candles[0][0]
+                if coverage is not None and coverage[1] >= first_ts:
+                    first_ts = min(first_ts, coverage[0])
+                self.store.set_coverage(coin_id, vs_currency, kind, first_ts, now_ms)
+        return start_ms, now_ms
+
+    def range_buckets(self, coin_id, time_range=DEFAULT_TIME_RANGE, vs_currency="usd", candles=False):
+        """Buckets da pirâmide para um período de TIME_RANGES, sincronizando antes a fonte certa"""
+        days, line_level, candle_level = TIME_RANGES[time_range]
+        level = candle_level if candles else line_level
+        if candles and PYRAMID_LEVELS[level] >= ohlc_resolution_ms(days):
+            start_ms, now_ms = self.sync_ohlc(coin_id, days, vs_currency)
+        else:
+            # /ohlc?days=90 devolve candles de 4 dias, que não preenchem o nível 1d:
+            # esses candles saem dos pontos horários de /market_chart
+            start_ms, now_ms = self.sync_market_chart(coin_id, days, vs_currency)
+        resolution = PYRAMID_LEVELS[level]
+        return self.store.read_pyramid(coin_id, vs_currency, level, start_ms // resolution * resolution, now_ms)
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_timeseries_store():
+    """Instância compartilhada do armazenamento de séries"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_lock:
+            if _shared_store is None:
+                _shared_store = TimeSeriesStore()
+    return _shared_store
@@ -0,0 +1,211 @@
+"""Modo sem interface: cotações e histórico de várias criptomoedas para cron e scripts.
+
+Uso: python main.py bitcoin ethereum --range 30d --format csv
+     python main.py --file moedas.txt --output cotacoes.jsonl
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api.coingecko_api import buscar_historico, buscar_precos_cripto
+from api.rate_limiter import rate_limiter
+from api.timeseries import DEFAULT_TIME_RANGE, TIME_RANGES, get_timeseries_store
+
+CSV_FIELDS = [
+    "id",
+    "vs_currency",
+    "price",
+    "change_24h",
+    "market_cap",
+    "volume_24h",
+    "last_updated_at",
+    "range",
+    "history_points",
+    "range_open",
+    "range_high",
+    "range_low",
+    "range_change",
+    "error",
+]
+
+
+def ler_ids(args):
+    """Ids da linha de comando e/ou de um arquivo (um por linha, '-' para stdin)"""
+    ids = list(args.coins)
+    if args.file:
+        arquivo = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+        with arquivo:
+            ids.extend(linha.split("#")[0].strip() for linha in arquivo)
+    return list(dict.fromkeys(i.lower() for i in ids if i))
+
+
+def salvar_cotacoes(cotacoes, vs_currencies):
+    """Grava cada cotação como um ponto da série local (alimenta a pirâmide OHLC)"""
+    store = get_timeseries_store()
+    agora = time.time()
+    for cripto, cotacao in cotacoes.items():
+        ts = int((cotacao.get("last_updated_at") or agora) * 1000)
+        for vs in vs_currencies:
+            if cotacao.get(vs) is None:
+                continue
+            store.upsert_market_chart(cripto, vs, {
+                "prices": [[ts, cotacao[vs]]],
+                "market_caps": [[ts, cotacao[f"{vs}_market_cap"]]] if cotacao.get(f"{vs}_market_cap") else [],
+                "total_volumes": [[ts, cotacao[f"{vs}_24h_vol"]]] if cotacao.get(f"{vs}_24h_vol") else [],
+            })
+
+
+def montar_registro(cripto, vs, cotacao, periodo, buckets, com_pontos):
+    registro = {
+        "id": cripto,
+        "vs_currency": vs,
+        "price": cotacao.get(vs),
+        "change_24h": cotacao.get(f"{vs}_24h_change"),
+        "market_cap": cotacao.get(f"{vs}_market_cap"),
+        "volume_24h": cotacao.get(f"{vs}_24h_vol"),
+        "last_updated_at": cotacao.get("last_updated_at"),
+    }
+    if periodo is None:
+        return registro
+
+    registro["range"] = periodo
+    registro["history_points"] = len(buckets or [])
+    if buckets:
+        abertura = buckets[0][2]
+        registro["range_open"] = abertura
+        registro["range_high"] = max(b[3] for b in buckets)
+        registro["range_low"] = min(b[4] for b in buckets)
+        if abertura:
+            registro["range_change"] = (buckets[-1][5] - abertura) / abertura * 100
+        if com_pontos:
+            registro["history"] = [[b[1], b[5]] for b in buckets]
+    return registro
+
+
+class Saida:
+    """Escreve os registros em JSON Lines ou CSV à medida que chegam"""
+
+    def __init__(self, stream, formato):
+        self.stream = stream
+        self.formato = formato
+        if formato == "csv":
+            self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self.writer.writeheader()
+
+    def escrever(self, registro):
+        if self.formato == "csv":
+            self.writer.writerow(registro)
+        else:
+            self.stream.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+def executar(args, saida):
+    """Busca tudo e escreve os registros; retorna (moedas processadas, moedas com erro)"""
+    ids = ler_ids(args)
+    vs = args.vs.lower()
+    periodo = None if args.range == "none" else args.range
+
+    # Todas as cotações saem em poucas requisições (uma por lote de URL)
+    falhas = {}
+    cotacoes = buscar_precos_cripto(
+        ids,
+        vs_currencies=vs,
+        falhas=falhas,
+        include_24hr_change="true",
+        include_market_cap="true",
+        include_24hr_vol="true",
+        include_last_updated_at="true",
+    )
+    if not args.no_store:
+        salvar_cotacoes(cotacoes, [vs])
+
+    erros = 0
+    for cripto in ids:
+        if cripto not in cotacoes:
+            erros += 1
+            # Lote que falhou (429, timeout...) não é o mesmo que id inexistente
+            erro = f"falha na API: {falhas[cripto]}" if cripto in falhas else "não encontrada"
+            saida.escrever({"id": cripto, "vs_currency": vs, "error": erro})
+    encontradas = [c for c in ids if c in cotacoes]
+
+    if periodo is None:
+        for cripto in encontradas:
+            saida.escrever(montar_registro(cripto, vs, cotacoes[cripto], None, None, False))
+        return len(ids), erros
+
+    # Históricos em paralelo; o limitador de taxa compartilhado dita o ritmo
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="cli") as executor:
+        futuros = {
+            executor.submit(buscar_historico, cripto, periodo, vs, args.ohlc): cripto
+            for cripto in encontradas
+        }
+        for futuro in as_completed(futuros):
+            cripto = futuros[futuro]
+            try:
+                buckets = futuro.result()
+            except Exception as e:
+                erros += 1
+                saida.escrever({"id": cripto, "vs_currency": vs, "error": str(e)})
+                continue
+            saida.escrever(montar_registro(cripto, vs, cotacoes[cripto], periodo, buckets, args.with_points))
+    return len(ids), erros
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Cotações e histórico de criptomoedas sem interface gráfica",
+    )
+    parser.add_argument("coins", nargs="*", help="ids da CoinGecko (ex.: bitcoin ethereum)")
+    parser.add_argument("--file", help="arquivo com um id por linha ('-' para stdin)")
+    parser.add_argument("--vs", default="usd", help="moeda de cotação (padrão: usd)")
+    parser.add_argument(
+        "--range",
+        default=DEFAULT_TIME_RANGE,
+        choices=[*TIME_RANGES, "none"],
+        help=f"período do histórico (padrão: {DEFAULT_TIME_RANGE}; 'none' só busca a cotação)",
+    )
+    parser.add_argument("--ohlc", action="store_true", help="usa candles (/ohlc) no resumo do período")
+    parser.add_argument("--with-points", action="store_true", help="inclui a série do período (só JSON Lines)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--output", default="-", help="arquivo de saída (padrão: stdout)")
+    parser.add_argument("--workers", type=int, default=4, help="buscas de histórico simultâneas")
+    parser.add_argument("--rate-per-minute", type=int, help="orçamento de requisições por minuto")
+    parser.add_argument("--no-store", action="store_true", help="não grava as cotações no SQLite local")
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if not args.coins and not args.file:
+        parser.error("informe ao menos um id ou --file")
+    if args.rate_per_minute:
+        rate_limiter.configure(per_minute=args.rate_per_minute)
+
+    stdout = sys.stdout
+    stream = stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    inicio = time.perf_counter()
+    try:
+        # Mensagens de log vão para stderr para não misturar com os dados
+        with contextlib.redirect_stdout(sys.stderr):
+            total, erros = executar(args, Saida(stream, args.format))
+    finally:
+        if stream is not stdout:
+            stream.close()
+
+    duracao = time.perf_counter() - inicio
+    print(
+        f"{total} moedas em {duracao:.2f}s ({total / duracao if duracao else 0:.2f} moedas/s), {erros} com erro",
+        file=sys.stderr,
+    )
+    return 1 if erros and erros == total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
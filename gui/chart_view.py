@@ -0,0 +1,294 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.dates import DateFormatter
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+BG_COLOR = "#1e1e2e"
+AXES_COLOR = "#313244"
+TEXT_COLOR = "#cdd6f4"
+GRID_COLOR = "#585b70"
+LEGEND_COLOR = "#45475a"
+ACCENT_COLOR = "#89b4fa"
+UP_COLOR = "#a6e3a1"
+DOWN_COLOR = "#f38ba8"
+REFERENCE_COLOR = "#f9e2af"
+VOLUME_COLOR = "#fab387"
+
+# Espera (ms) após o último evento de redimensionamento antes de redesenhar
+RESIZE_DEBOUNCE_MS = 150
+
+LEGEND_STYLE = dict(
+    loc="upper left",
+    facecolor=LEGEND_COLOR,
+    edgecolor="none",
+    labelcolor=TEXT_COLOR,
+    fontsize=9,
+)
+
+
+def bar_width(dates, fraction):
+    """Largura das barras/candles como fração do espaçamento típico entre pontos"""
+    if len(dates) < 2:
+        return fraction
+    return fraction * float(np.median(np.diff(dates)))
+
+
+def rect_verts(x, half_width, bottom, top):
+    """Vértices (n, 4, 2) de n retângulos centrados em x, para PolyCollection"""
+    left, right = x - half_width, x + half_width
+    return np.stack((
+        np.column_stack((left, bottom)),
+        np.column_stack((left, top)),
+        np.column_stack((right, top)),
+        np.column_stack((right, bottom)),
+    ), axis=1)
+
+
+def padded_limits(low, high, margin=0.05):
+    """Limites com uma folga proporcional ao intervalo"""
+    span = high - low
+    if not np.isfinite(span) or span <= 0:
+        span = abs(high) or 1.0
+    return low - span * margin, high + span * margin
+
+
+class ChartView:
+    """Figura persistente do gráfico: novas buscas só atualizam os dados dos artistas"""
+
+    def __init__(self, master, width_px, height_px):
+        self.figure = Figure(
+            figsize=(max(width_px / 100, 10), max(height_px / 100, 6)),
+            facecolor=BG_COLOR,
+            layout="constrained",
+        )
+        grid = self.figure.add_gridspec(2, 1, height_ratios=[3, 1])
+        self.ax_price = self.figure.add_subplot(grid[0])
+        self.ax_volume = self.figure.add_subplot(grid[1], sharex=self.ax_price)
+
+        for ax in (self.ax_price, self.ax_volume):
+            ax.set_facecolor(AXES_COLOR)
+            ax.tick_params(colors=TEXT_COLOR, labelsize=9)
+            ax.grid(True, alpha=0.2, color=GRID_COLOR)
+            ax.xaxis_date()
+            ax.xaxis.set_major_formatter(DateFormatter("%d/%m"))
+            ax.tick_params(axis="x", labelrotation=45)
+
+        self.ax_price.set_ylabel("Preço (USD)", fontsize=10, color=TEXT_COLOR)
+        self.ax_price.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f"${x:,.2f}"))
+        self.ax_volume.set_ylabel("Volume (USD)", fontsize=10, color=TEXT_COLOR)
+        self.ax_volume.set_xlabel("Data", fontsize=10, color=TEXT_COLOR)
+        self.ax_volume.yaxis.set_major_formatter(
+            FuncFormatter(lambda x, p: f"${x/1e9:.1f}B" if x >= 1e9 else f"${x/1e6:.1f}M")
+        )
+
+        # Artistas do gráfico de linha
+        self.price_line, = self.ax_price.plot([], [], linewidth=2.5, color=ACCENT_COLOR, alpha=0.9)
+        self.price_fill = PolyCollection([], facecolors=to_rgba(ACCENT_COLOR, 0.2), edgecolors="none")
+        self.ax_price.add_collection(self.price_fill)
+        self.max_marker, = self.ax_price.plot([], [], "o", color=UP_COLOR, markersize=10, zorder=5)
+        self.min_marker, = self.ax_price.plot([], [], "o", color=DOWN_COLOR, markersize=10, zorder=5)
+        self.line_artists = [self.price_line, self.price_fill, self.max_marker, self.min_marker]
+
+        # Candlestick: todos os pavios numa LineCollection e todos os corpos numa PolyCollection
+        self.candle_wicks = LineCollection([], linewidths=1, alpha=0.9)
+        self.candle_bodies = PolyCollection([], edgecolors="none", alpha=0.9)
+        self.ax_price.add_collection(self.candle_wicks)
+        self.ax_price.add_collection(self.candle_bodies)
+        self.candle_artists = [self.candle_wicks, self.candle_bodies]
+
+        # Linha de referência: preço atual (linha) ou média (candlestick)
+        self.reference_line = self.ax_price.axhline(
+            0, color=REFERENCE_COLOR, linestyle="--", linewidth=1.5, alpha=0.8
+        )
+
+        self.volume_bars = PolyCollection([], edgecolors="none", label="Volume 24h")
+        self.ax_volume.add_collection(self.volume_bars)
+
+        self.resize_job = None
+        self.pending_resize = None
+        if master is None:
+            # Sem Tk (ex.: tools/benchmark.py): o redesenho renderiza direto no Agg
+            self.canvas = FigureCanvasAgg(self.figure)
+        else:
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            widget = self.canvas.get_tk_widget()
+            widget.pack(fill="both", expand=True, padx=10, pady=10)
+
+            # Substitui o <Configure> do matplotlib, que redesenha a cada pixel do arraste;
+            # enquanto o usuário arrasta, a última imagem renderizada continua na tela
+            widget.bind("<Configure>", self.on_configure)
+
+        self.period_label = "30 dias"
+        # Séries exibidas no momento, mantidas para o modo ao vivo
+        self.line_series = None
+        self.candle_series = None
+
+    def set_period(self, label, date_format):
+        """Rótulo do período nos títulos e formato das datas no eixo x"""
+        self.period_label = label
+        for ax in (self.ax_price, self.ax_volume):
+            ax.xaxis.set_major_formatter(DateFormatter(date_format))
+
+    def on_configure(self, event):
+        """Agrupa os eventos de redimensionamento e redesenha só no tamanho final"""
+        self.pending_resize = event
+        widget = self.canvas.get_tk_widget()
+        if self.resize_job:
+            widget.after_cancel(self.resize_job)
+        self.resize_job = widget.after(RESIZE_DEBOUNCE_MS, self.apply_resize)
+
+    def apply_resize(self):
+        self.resize_job = None
+        event, self.pending_resize = self.pending_resize, None
+        if event is not None and event.width > 1 and event.height > 1:
+            # FigureCanvasTkAgg.resize ajusta a figura e agenda um draw_idle
+            self.canvas.resize(event)
+
+    def _align_date_labels(self):
+        for ax in (self.ax_price, self.ax_volume):
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment("right")
+
+    def _set_mode(self, candles):
+        for artist in self.line_artists:
+            artist.set_visible(not candles)
+        for artist in self.candle_artists:
+            artist.set_visible(candles)
+
+    def show_line(self, crypto_name, series, current_usd):
+        """Atualiza o gráfico de linha com uma nova série de preços"""
+        self._set_mode(candles=False)
+        self.line_series = series
+        self.candle_series = None
+
+        self.price_line.set_label(f"{crypto_name.upper()} Price")
+        self.ax_price.set_title(
+            f"{crypto_name.upper()} - Price Chart ({self.period_label})",
+            fontsize=12,
+            color=TEXT_COLOR,
+            pad=20,
+            y=1.05,
+        )
+        self._draw_line(current_usd)
+
+    def _draw_line(self, current_usd):
+        series = self.line_series
+        dates, prices = series.dates, series.prices
+        self.price_line.set_data(dates, prices)
+        self.price_fill.set_verts([
+            np.column_stack((
+                np.concatenate(([dates[0]], dates, [dates[-1]])),
+                np.concatenate(([0.0], prices, [0.0])),
+            ))
+        ])
+
+        max_idx = int(np.argmax(prices))
+        min_idx = int(np.argmin(prices))
+        self.max_marker.set_data([dates[max_idx]], [prices[max_idx]])
+        self.max_marker.set_label(f"Máximo: ${prices[max_idx]:.2f}")
+        self.min_marker.set_data([dates[min_idx]], [prices[min_idx]])
+        self.min_marker.set_label(f"Mínimo: ${prices[min_idx]:.2f}")
+
+        self.reference_line.set_ydata([current_usd, current_usd])
+        self.reference_line.set_linewidth(1.5)
+        self.reference_line.set_alpha(0.8)
+        self.reference_line.set_label(f"Atual: ${current_usd:.2f}")
+
+        self.ax_price.legend(
+            handles=[self.price_line, self.max_marker, self.min_marker, self.reference_line],
+            **LEGEND_STYLE,
+        )
+
+        self.ax_price.set_xlim(*padded_limits(dates[0], dates[-1], 0.02))
+        self.ax_price.set_ylim(0, max(prices[max_idx], current_usd) * 1.05)
+
+    def show_candles(self, crypto_name, ohlc):
+        """Atualiza o candlestick; retorna False se não houver como desenhá-lo"""
+        if ohlc is None or not len(ohlc):
+            return False
+
+        self._set_mode(candles=True)
+        self.candle_series = ohlc
+        self.line_series = None
+
+        self.ax_price.set_title(
+            f"{crypto_name.upper()} - Candlestick Chart ({self.period_label}, USD)",
+            fontsize=12,
+            color=ACCENT_COLOR,
+            pad=20,
+            y=1.05,
+        )
+        self._draw_candles()
+        return True
+
+    def _draw_candles(self):
+        ohlc = self.candle_series
+        dates = ohlc.dates
+        up = ohlc.close >= ohlc.open
+        colors = np.where(up[:, None], to_rgba(UP_COLOR), to_rgba(DOWN_COLOR))
+
+        self.candle_wicks.set_segments(np.stack((
+            np.column_stack((dates, ohlc.low)),
+            np.column_stack((dates, ohlc.high)),
+        ), axis=1))
+        self.candle_wicks.set_colors(colors)
+
+        self.candle_bodies.set_verts(rect_verts(
+            dates,
+            bar_width(dates, 0.6) / 2,
+            np.minimum(ohlc.open, ohlc.close),
+            np.maximum(ohlc.open, ohlc.close),
+        ))
+        self.candle_bodies.set_facecolors(colors)
+
+        avg_price = float(np.mean(ohlc.close))
+        self.reference_line.set_ydata([avg_price, avg_price])
+        self.reference_line.set_linewidth(1)
+        self.reference_line.set_alpha(0.7)
+        self.reference_line.set_label(f"Média: ${avg_price:.2f}")
+        self.ax_price.legend(handles=[self.reference_line], **LEGEND_STYLE)
+
+        self.ax_price.set_xlim(*padded_limits(dates[0], dates[-1], 0.02))
+        self.ax_price.set_ylim(*padded_limits(float(np.min(ohlc.low)), float(np.max(ohlc.high))))
+
+    def apply_tick(self, timestamp_ms, price):
+        """Aplica um preço ao vivo só ao último ponto/candle exibido e redesenha"""
+        if self.candle_series is not None and len(self.candle_series):
+            self.candle_series.apply_tick(timestamp_ms, price)
+            self._draw_candles()
+        elif self.line_series is not None and len(self.line_series):
+            self.line_series.apply_tick(timestamp_ms, price)
+            self._draw_line(price)
+        else:
+            return
+        self.redraw()
+
+    def show_volume(self, series):
+        """Atualiza as barras de volume, destacando as acima de 1,5x a média"""
+        if not series.has_volume():
+            self.volume_bars.set_verts([])
+            self.ax_volume.legend([], [], frameon=False)
+            return
+
+        dates = series.dates
+        volumes = np.nan_to_num(series.volumes)
+        avg_volume = np.nanmean(series.volumes)
+        palette = np.array([to_rgba(VOLUME_COLOR, 0.7), to_rgba(UP_COLOR, 0.9)])
+        colors = palette[(volumes > avg_volume * 1.5).astype(int)]
+
+        self.volume_bars.set_verts(
+            rect_verts(dates, bar_width(dates, 0.8) / 2, np.zeros_like(dates), volumes)
+        )
+        self.volume_bars.set_facecolors(colors)
+
+        self.ax_volume.legend(handles=[self.volume_bars], **LEGEND_STYLE)
+        self.ax_volume.set_ylim(0, float(volumes.max()) * 1.1 or 1.0)
+
+    def redraw(self):
+        """Agenda o redesenho para quando o Tk estiver ocioso"""
+        self._align_date_labels()
+        self.canvas.draw_idle()
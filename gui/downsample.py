@@ -0,0 +1,89 @@
+import numpy as np
+
+from gui.series import OHLCSeries
+
+# Densidade máxima desenhada, em função da largura do gráfico em pixels
+POINTS_PER_PIXEL = 1
+PIXELS_PER_CANDLE = 4
+PIXELS_PER_BAR = 3
+
+
+def lttb_indices(x, y, threshold):
+    """Índices escolhidos pelo Largest-Triangle-Three-Buckets"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def downsample_line(series, width_px):
+    """Reduz a série de preços com LTTB, mantendo sempre o máximo e o mínimo"""
+    threshold = int(width_px * POINTS_PER_PIXEL)
+    if len(series) <= threshold:
+        return series
+
+    indices = lttb_indices(series.dates, series.prices, threshold)
+    extremes = [np.argmax(series.prices), np.argmin(series.prices)]
+    return series.take(np.union1d(indices, extremes))
+
+
+def bucket_starts(size, max_buckets):
+    """Início de cada grupo de itens consecutivos para caber em max_buckets"""
+    step = int(np.ceil(size / max(max_buckets, 1)))
+    return np.arange(0, size, step), step
+
+
+def downsample_volume(series, width_px):
+    """Mantém, em cada grupo de barras, a de maior volume"""
+    max_bars = max(int(width_px / PIXELS_PER_BAR), 1)
+    if len(series) <= max_bars:
+        return series
+
+    starts, step = bucket_starts(len(series), max_bars)
+    volumes = np.nan_to_num(series.volumes, nan=-np.inf)
+    padded = np.full(len(starts) * step, -np.inf)
+    padded[:len(volumes)] = volumes
+    indices = starts + np.argmax(padded.reshape(-1, step), axis=1)
+    return series.take(indices)
+
+
+def downsample_candles(ohlc, width_px):
+    """Agrupa candles consecutivos preservando abertura, máxima, mínima e fechamento"""
+    max_candles = max(int(width_px / PIXELS_PER_CANDLE), 1)
+    if ohlc is None or len(ohlc) <= max_candles:
+        return ohlc
+
+    starts, step = bucket_starts(len(ohlc), max_candles)
+    ends = np.minimum(starts + step, len(ohlc)) - 1
+
+    grouped = OHLCSeries.__new__(OHLCSeries)
+    # Cada grupo fica no centro do trecho que cobre, como os candles originais
+    grouped.timestamps_ms = (ohlc.timestamps_ms[starts] + ohlc.timestamps_ms[ends]) / 2
+    grouped.dates = (ohlc.dates[starts] + ohlc.dates[ends]) / 2
+    grouped.open = ohlc.open[starts]
+    grouped.high = np.maximum.reduceat(ohlc.high, starts)
+    grouped.low = np.minimum.reduceat(ohlc.low, starts)
+    grouped.close = ohlc.close[ends]
+    return grouped
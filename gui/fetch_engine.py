@@ -0,0 +1,118 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FetchEngine:
+    """Executa requisições em threads de fundo e entrega os resultados na thread do Tk"""
+
+    def __init__(self, root, max_workers=4, poll_interval=50):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self.results = queue.Queue()
+        self.generation = 0
+        self.pending = []
+        self.closed = False
+        self.poll_job = self.root.after(self.poll_interval, self.poll_results)
+
+    def new_generation(self):
+        """Inicia uma nova geração, cancelando o que ainda não começou a executar"""
+        self.generation += 1
+        for future in self.pending:
+            future.cancel()
+        self.pending = []
+        return self.generation
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Agenda fn(*args) em background; os callbacks rodam na thread do Tk"""
+        if self.closed:
+            return None
+
+        generation = self.generation
+        future = self.executor.submit(fn, *args)
+        self.pending = [f for f in self.pending if not f.done()]
+        self.pending.append(future)
+        future.add_done_callback(
+            lambda f: self.results.put((generation, f, on_done, on_error))
+        )
+        return future
+
+    def submit_all(self, calls, on_done=None, on_error=None):
+        """Agenda várias chamadas em paralelo; on_done recebe todos os resultados juntos"""
+        results = [None] * len(calls)
+        remaining = len(calls)
+        failed = False
+
+        def make_done(index):
+            def done(result):
+                nonlocal remaining
+                results[index] = result
+                remaining -= 1
+                if remaining == 0 and not failed and on_done:
+                    on_done(results)
+            return done
+
+        def error(e):
+            nonlocal failed
+            if failed:
+                return
+            failed = True
+            if on_error:
+                on_error(e)
+            else:
+                print(f"Erro em tarefa de background: {e}")
+
+        return [
+            self.submit(fn, *args, on_done=make_done(index), on_error=error)
+            for index, (fn, *args) in enumerate(calls)
+        ]
+
+    def poll_results(self):
+        """Despacha os resultados prontos (chamado periodicamente via root.after)"""
+        try:
+            while True:
+                try:
+                    generation, future, on_done, on_error = self.results.get_nowait()
+                except queue.Empty:
+                    break
+
+                # Resultados de buscas antigas são descartados
+                if generation != self.generation or future.cancelled():
+                    continue
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if on_error:
+                        self._run_callback(on_error, e)
+                    else:
+                        print(f"Erro em tarefa de background: {e}")
+                    continue
+
+                self._run_callback(on_done, result)
+        finally:
+            # Reagendado mesmo se algo acima falhar: sem isso nenhum resultado seria entregue
+            if not self.closed:
+                self.poll_job = self.root.after(self.poll_interval, self.poll_results)
+
+    @staticmethod
+    def _run_callback(callback, value):
+        """Executa um callback sem deixar que um erro nele interrompa o despacho dos demais"""
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Erro em callback de tarefa de background: {e}")
+
+    def shutdown(self):
+        """Para o despacho e descarta as tarefas pendentes"""
+        if self.closed:
+            return
+        self.closed = True
+        self.generation += 1
+        try:
+            self.root.after_cancel(self.poll_job)
+        except Exception:
+            pass
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,302 @@
+import tkinter as tk
+import tkinter.ttk as ttk
+from datetime import datetime, timezone
+
+# Linhas buscadas por vez no banco
+PAGE_SIZE = 200
+
+# Máximo de linhas mantidas no Treeview; as que saem da janela são recarregadas ao voltar
+MAX_LOADED_ROWS = 1000
+
+# Fração da rolagem perto das bordas que dispara o carregamento da próxima página
+SCROLL_MARGIN = 0.15
+
+ALL_COINS = "Todas"
+
+COLUMNS = ("Cripto", "Data", "Preço USD", "Preço BRL", "Variação 24h")
+
+
+def format_row(row):
+    """Valores e tags de uma linha (id, cripto, data, usd, brl, variação) do histórico"""
+    _, crypto_name, search_date, price_usd, price_brl, change_24h = row
+    try:
+        date_obj = datetime.fromisoformat(search_date).replace(tzinfo=timezone.utc).astimezone()
+        formatted_date = date_obj.strftime("%d/%m/%Y %H:%M")
+    except Exception:
+        formatted_date = search_date
+
+    formatted_usd = f"${price_usd:,.4f}" if price_usd else "N/A"
+    formatted_brl = f"R$ {price_brl:,.2f}" if price_brl else "N/A"
+
+    if change_24h:
+        if change_24h >= 0:
+            formatted_change, tags = f"▲ {change_24h:+.2f}%", ("positive",)
+        else:
+            formatted_change, tags = f"▼ {change_24h:+.2f}%", ("negative",)
+    else:
+        formatted_change, tags = "N/A", ()
+
+    values = (crypto_name.upper(), formatted_date, formatted_usd, formatted_brl, formatted_change)
+    return values, tags
+
+
+class HistoryBrowser:
+    """Histórico paginado por chave (search_date, id), carregado conforme a rolagem"""
+
+    def __init__(self, master, store):
+        self.store = store
+        self.crypto_name = None
+        self.keys = []  # (search_date, id) de cada linha do Treeview, na mesma ordem
+        self.has_newer = False
+        self.has_older = True
+        self.loading = False
+        self.load_job = None
+
+        filter_frame = tk.Frame(master, bg="#313244")
+        filter_frame.pack(fill="x", padx=10, pady=(5, 10))
+
+        tk.Label(
+            filter_frame,
+            text="🔎 Moeda:",
+            font=("Segoe UI", 11),
+            fg="#cdd6f4",
+            bg="#313244",
+        ).pack(side="left", padx=(0, 8))
+
+        self.filter_box = ttk.Combobox(
+            filter_frame,
+            values=[ALL_COINS, *store.coins()],
+            state="readonly",
+            width=25,
+        )
+        self.filter_box.set(ALL_COINS)
+        self.filter_box.pack(side="left")
+        self.filter_box.bind("<<ComboboxSelected>>", self.on_filter)
+
+        self.count_label = tk.Label(filter_frame, font=("Segoe UI", 10), fg="#7f849c", bg="#313244")
+        self.count_label.pack(side="right")
+
+        list_frame = tk.Frame(master, bg="#313244")
+        list_frame.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(list_frame, columns=COLUMNS, show="headings", height=20)
+        self.tree.column("Cripto", width=120, anchor="center")
+        self.tree.column("Data", width=180, anchor="center")
+        self.tree.column("Preço USD", width=180, anchor="center")
+        self.tree.column("Preço BRL", width=180, anchor="center")
+        self.tree.column("Variação 24h", width=150, anchor="center")
+        for col in COLUMNS:
+            self.tree.heading(col, text=col)
+
+        # Tags configuradas uma única vez, não a cada linha
+        self.tree.tag_configure("positive", foreground="#a6e3a1")
+        self.tree.tag_configure("negative", foreground="#f38ba8")
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.reload()
+
+    def on_filter(self, event=None):
+        selected = self.filter_box.get()
+        self.crypto_name = None if selected == ALL_COINS else selected
+        self.reload()
+
+    def reload(self):
+        """Volta para a página mais recente do filtro atual"""
+        self.tree.delete(*self.tree.get_children())
+        self.keys = []
+        self.has_newer = False
+        self.has_older = True
+        self.load_older()
+        self.tree.yview_moveto(0)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.loading or self.load_job:
+            return
+        first, last = float(first), float(last)
+        if last >= 1 - SCROLL_MARGIN and self.has_older:
+            self.load_job = self.tree.after_idle(self.load_older)
+        elif first <= SCROLL_MARGIN and self.has_newer:
+            self.load_job = self.tree.after_idle(self.load_newer)
+
+    def load_older(self):
+        """Acrescenta ao fim a página seguinte (mais antiga)"""
+        self.load_job = None
+        if self.loading or not self.has_older:
+            return
+        self.loading = True
+        try:
+            before = self.keys[-1] if self.keys else None
+            rows = self.store.page(self.crypto_name, before=before, limit=PAGE_SIZE)
+            self.has_older = len(rows) == PAGE_SIZE
+            for row in rows:
+                values, tags = format_row(row)
+                self.tree.insert("", "end", values=values, tags=tags)
+                self.keys.append((row[2], row[0]))
+
+            excess = len(self.keys) - MAX_LOADED_ROWS
+            if excess > 0:
+                self._drop(excess, from_top=True)
+                self.has_newer = True
+        finally:
+            self.loading = False
+        self.update_count()
+
+    def load_newer(self):
+        """Recarrega no topo a página que saiu da janela ao rolar para baixo"""
+        self.load_job = None
+        if self.loading or not self.has_newer or not self.keys:
+            return
+        self.loading = True
+        try:
+            rows = self.store.page(self.crypto_name, after=self.keys[0], limit=PAGE_SIZE)
+            self.has_newer = len(rows) == PAGE_SIZE
+            first, _ = self.tree.yview()
+            total = len(self.keys)
+            for index, row in enumerate(rows):
+                values, tags = format_row(row)
+                self.tree.insert("", index, values=values, tags=tags)
+            self.keys[:0] = [(row[2], row[0]) for row in rows]
+
+            excess = len(self.keys) - MAX_LOADED_ROWS
+            if excess > 0:
+                self._drop(excess, from_top=False)
+                self.has_older = True
+
+            # Mantém na tela as mesmas linhas de antes da inserção
+            if self.keys:
+                self.tree.yview_moveto((first * total + len(rows)) / len(self.keys))
+        finally:
+            self.loading = False
+        self.update_count()
+
+    def _drop(self, count, from_top):
+        """Remove linhas de uma das pontas para manter a memória limitada"""
+        children = self.tree.get_children()
+        if from_top:
+            first, _ = self.tree.yview()
+            total = len(children)
+            self.tree.delete(*children[:count])
+            del self.keys[:count]
+            self.tree.yview_moveto(max(0.0, (first * total - count) / len(self.keys)))
+        else:
+            self.tree.delete(*children[-count:])
+            del self.keys[-count:]
+
+    def update_count(self):
+        if not self.keys:
+            self.count_label.config(text="Nenhuma consulta encontrada")
+            return
+        more = " (role para ver mais)" if self.has_older else ""
+        self.count_label.config(text=f"{len(self.keys)} linhas carregadas{more}")
+
+
+STATS_COLUMNS = ("Cripto", "Dia (UTC)", "Buscas", "Mínimo USD", "Máximo USD", "Média USD", "Último USD")
+
+# Períodos do resumo diário: (rótulo, dias)
+STATS_PERIODS = [("7 dias", 7), ("30 dias", 30), ("90 dias", 90), ("1 ano", 365)]
+
+
+def format_usd(value):
+    return f"${value:,.4f}" if value else "N/A"
+
+
+class StatsView:
+    """Estatísticas do histórico lidas dos resumos pré-calculados (sem varrer as buscas)"""
+
+    def __init__(self, master, store):
+        self.store = store
+
+        filter_frame = tk.Frame(master, bg="#313244")
+        filter_frame.pack(fill="x", padx=10, pady=(5, 10))
+
+        tk.Label(
+            filter_frame,
+            text="🔎 Moeda:",
+            font=("Segoe UI", 11),
+            fg="#cdd6f4",
+            bg="#313244",
+        ).pack(side="left", padx=(0, 8))
+
+        self.coin_box = ttk.Combobox(
+            filter_frame,
+            values=[ALL_COINS, *store.coins()],
+            state="readonly",
+            width=20,
+        )
+        self.coin_box.set(ALL_COINS)
+        self.coin_box.pack(side="left")
+        self.coin_box.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+
+        self.period_box = ttk.Combobox(
+            filter_frame,
+            values=[label for label, _ in STATS_PERIODS],
+            state="readonly",
+            width=10,
+        )
+        self.period_box.set("30 dias")
+        self.period_box.pack(side="left", padx=8)
+        self.period_box.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+
+        self.summary_label = tk.Label(
+            master,
+            font=("Segoe UI", 11),
+            fg="#cdd6f4",
+            bg="#313244",
+            justify="left",
+            anchor="w",
+        )
+        self.summary_label.pack(fill="x", padx=10, pady=(0, 8))
+
+        list_frame = tk.Frame(master, bg="#313244")
+        list_frame.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(list_frame, columns=STATS_COLUMNS, show="headings", height=16)
+        for col in STATS_COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=110, anchor="center")
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.refresh()
+
+    def refresh(self):
+        selected = self.coin_box.get()
+        crypto_name = None if selected == ALL_COINS else selected
+        days = dict(STATS_PERIODS)[self.period_box.get()]
+
+        self.tree.delete(*self.tree.get_children())
+        for name, day, searches, min_usd, max_usd, avg_usd, last_usd in self.store.daily_stats(crypto_name, days):
+            self.tree.insert("", "end", values=(
+                name.upper(),
+                day,
+                searches,
+                format_usd(min_usd),
+                format_usd(max_usd),
+                format_usd(avg_usd),
+                format_usd(last_usd),
+            ))
+
+        totals = [row for row in self.store.coin_stats() if crypto_name in (None, row[0])]
+        if not totals:
+            self.summary_label.config(text="Nenhuma consulta registrada")
+            return
+        searches = sum(row[1] for row in totals)
+        if crypto_name:
+            _, _, first_date, last_date, last_usd = totals[0]
+            text = (
+                f"🪙 {crypto_name.upper()}: {searches} buscas | "
+                f"primeira em {first_date[:10]}, última em {last_date[:10]} | último preço {format_usd(last_usd)}"
+            )
+        else:
+            top = ", ".join(f"{name.upper()} ({count})" for name, count, *_ in totals[:5])
+            text = f"📊 {searches} buscas em {len(totals)} moedas | mais buscadas: {top}"
+        self.summary_label.config(text=text)
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+
+import matplotlib.dates as mdates
+import numpy as np
+
+MS_PER_DAY = 86_400_000.0
+
+
+def local_utc_offset_ms(timestamp_ms):
+    """Diferença entre o horário local e UTC (ms) no instante dado"""
+    seconds = timestamp_ms / 1000
+    local = datetime.fromtimestamp(seconds)
+    utc = datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+    return (local - utc).total_seconds() * 1000
+
+
+def ms_to_datenum(timestamps_ms):
+    """Converte timestamps em ms para números de data do matplotlib (horário local)"""
+    timestamps_ms = np.asarray(timestamps_ms, dtype=np.float64)
+    if not len(timestamps_ms):
+        return timestamps_ms
+    epoch = mdates.date2num(datetime(1970, 1, 1))
+    offset = local_utc_offset_ms(timestamps_ms[-1])
+    return (timestamps_ms + offset) / MS_PER_DAY + epoch
+
+
+def spacing_ms(timestamps_ms):
+    """Espaçamento típico (ms) entre pontos consecutivos, ou None"""
+    if len(timestamps_ms) < 2:
+        return None
+    return float(np.median(np.diff(timestamps_ms)))
+
+
+class PriceSeries:
+    """Série de preço, market cap e volume em colunas NumPy"""
+
+    __slots__ = ("timestamps_ms", "dates", "prices", "market_caps", "volumes")
+
+    def __init__(self, timestamps_ms, prices, market_caps=None, volumes=None):
+        self.timestamps_ms = np.asarray(timestamps_ms, dtype=np.float64)
+        self.dates = ms_to_datenum(self.timestamps_ms)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        size = len(self.timestamps_ms)
+        self.market_caps = np.full(size, np.nan) if market_caps is None else np.asarray(market_caps, dtype=np.float64)
+        self.volumes = np.full(size, np.nan) if volumes is None else np.asarray(volumes, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.timestamps_ms)
+
+    def take(self, indices):
+        """Nova série só com os pontos nos índices dados (sem reconverter datas)"""
+        subset = PriceSeries.__new__(PriceSeries)
+        for name in self.__slots__:
+            setattr(subset, name, getattr(self, name)[indices])
+        return subset
+
+    def has_volume(self):
+        return bool(len(self.volumes)) and not np.isnan(self.volumes).all()
+
+    def apply_tick(self, timestamp_ms, price):
+        """Atualiza o último ponto com um preço ao vivo ou, num novo bucket, acrescenta um ponto"""
+        spacing = spacing_ms(self.timestamps_ms)
+        if spacing and timestamp_ms // spacing > self.timestamps_ms[-1] // spacing:
+            self.timestamps_ms = np.append(self.timestamps_ms, timestamp_ms)
+            self.dates = np.append(self.dates, ms_to_datenum([timestamp_ms]))
+            self.prices = np.append(self.prices, price)
+            self.market_caps = np.append(self.market_caps, np.nan)
+            self.volumes = np.append(self.volumes, np.nan)
+            return True
+
+        self.timestamps_ms[-1] = max(self.timestamps_ms[-1], timestamp_ms)
+        self.dates[-1] = ms_to_datenum(self.timestamps_ms[-1:])[0]
+        self.prices[-1] = price
+        return False
+
+
+class OHLCSeries:
+    """Candles OHLC em colunas NumPy"""
+
+    __slots__ = ("timestamps_ms", "dates", "open", "high", "low", "close")
+
+    def __init__(self, timestamps_ms, open_, high, low, close):
+        self.timestamps_ms = np.asarray(timestamps_ms, dtype=np.float64)
+        self.dates = ms_to_datenum(self.timestamps_ms)
+        self.open = np.asarray(open_, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.timestamps_ms)
+
+    def take(self, indices):
+        """Nova série só com os candles nos índices dados (sem reconverter datas)"""
+        subset = OHLCSeries.__new__(OHLCSeries)
+        for name in self.__slots__:
+            setattr(subset, name, getattr(self, name)[indices])
+        return subset
+
+    def apply_tick(self, timestamp_ms, price):
+        """Atualiza o último candle com um preço ao vivo ou abre um candle novo; retorna True se abriu"""
+        spacing = spacing_ms(self.timestamps_ms)
+        # Os candles ficam no centro do bucket
+        if spacing and timestamp_ms >= self.timestamps_ms[-1] + spacing / 2:
+            steps = np.floor((timestamp_ms - self.timestamps_ms[-1] + spacing / 2) / spacing)
+            center = self.timestamps_ms[-1] + steps * spacing
+            previous_close = self.close[-1]
+            self.timestamps_ms = np.append(self.timestamps_ms, center)
+            self.dates = np.append(self.dates, ms_to_datenum([center]))
+            self.open = np.append(self.open, previous_close)
+            self.high = np.append(self.high, max(previous_close, price))
+            self.low = np.append(self.low, min(previous_close, price))
+            self.close = np.append(self.close, price)
+            return True
+
+        self.high[-1] = max(self.high[-1], price)
+        self.low[-1] = min(self.low[-1], price)
+        self.close[-1] = price
+        return False
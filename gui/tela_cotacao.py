@@ -1,28 +1,47 @@
 import tkinter as tk
-import requests
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.dates import DateFormatter
-import matplotlib.dates as mdates
+from datetime import datetime
+import matplotlib.style
 import numpy as np
-from matplotlib.patches import Rectangle
-import seaborn as sns
-import sqlite3
 import os
-import matplotlib.dates as mpdates
 import time 
-
-# Tentar importar mplfinance, se não conseguir, usar implementação alternativa
-try:
-    from mplfinance.original_flavor import candlestick_ohlc
-    MPLFINANCE_AVAILABLE = True
-except ImportError:
-    MPLFINANCE_AVAILABLE = False
-    print("mplfinance não disponível, usando gráficos de linha apenas")
-
-plt.style.use("seaborn-v0_8-darkgrid")
-sns.set_palette("husl")
+from api.cache import canonical_key
+from api.fetcher import get_cached_fetcher
+from api.history_store import get_history_store
+from api.http_client import DEFAULT_MAX_RETRIES
+from api.rate_limiter import rate_limiter
+from api.timeseries import DEFAULT_TIME_RANGE, PYRAMID_LEVELS, TIME_RANGES, IncrementalHistory
+from gui.chart_view import RESIZE_DEBOUNCE_MS, ChartView
+from gui.downsample import downsample_candles, downsample_line, downsample_volume
+from gui.fetch_engine import FetchEngine
+from gui.history_view import HistoryBrowser, StatsView
+from gui.series import OHLCSeries, PriceSeries
+
+# O estilo vem do próprio matplotlib; as cores do gráfico são definidas em gui/chart_view.py
+matplotlib.style.use("seaborn-v0_8-darkgrid")
+
+POPULAR_CRYPTOS = [
+    ("₿ Bitcoin", "bitcoin"),
+    ("Ξ Ethereum", "ethereum"),
+    ("◎ Solana", "solana"),
+    ("₳ Cardano", "cardano"),
+    ("Ð Dogecoin", "dogecoin"),
+]
+
+# Intervalo (s) entre consultas do modo ao vivo
+LIVE_INTERVAL = int(os.environ.get("COINGECKO_LIVE_INTERVAL", "15"))
+
+# Fração do orçamento do limitador que o modo ao vivo pode consumir
+LIVE_BUDGET_SHARE = 0.5
+
+# Períodos do seletor: (chave em TIME_RANGES, rótulo, formato das datas no eixo x)
+TIME_RANGE_OPTIONS = [
+    ("1d", "24h", "%H:%M"),
+    ("7d", "7 dias", "%d/%m"),
+    ("30d", "30 dias", "%d/%m"),
+    ("90d", "90 dias", "%d/%m"),
+    ("1y", "1 ano", "%m/%Y"),
+    ("max", "Máx", "%m/%Y"),
+]
 
 
 class CryptoChartApp:
@@ -30,86 +49,50 @@ class CryptoChartApp:
         self.root = root
         self.current_crypto = "bitcoin"
         self.chart_canvas = None
+        self.chart_view = None
+        self.resize_job = None
+        self.pending_window_width = 0
         self.chart_type = "candlestick"
-        self.cache = {}
-        self.last_request_time = 0  
+        self.time_range = DEFAULT_TIME_RANGE
+        self.range_buttons = {}
+        self.last_price = None
+        self.live_job = None
+        self.live_button = None
+        # Caches e single-flight são compartilhados com o modo servidor (api/fetcher.py)
+        self.fetcher = get_cached_fetcher()
+        self.cache = self.fetcher.cache
+        self.response_cache = self.fetcher.response_cache
+        # Séries históricas ficam salvas localmente; a API só completa o final
+        self.history_sync = IncrementalHistory(
+            lambda url, params: self.make_api_request(url, params, use_cache=False)
+        )
         self.setup_database()
         self.setup_ui()
         self.setup_responsive_layout()
-        
-        self.root.after(300000, self.clear_old_cache) 
 
-    def make_api_request(self, url, params=None, max_retries=2):
+        # Todo I/O de rede roda fora da thread do Tk
+        self.fetch_engine = FetchEngine(self.root)
+        self.status_frame.bind("<Destroy>", lambda e: self.on_screen_destroy())
+
+    def on_screen_destroy(self):
+        """Encerra o modo ao vivo e as tarefas de fundo ao sair da tela"""
+        self.stop_live()
+        self.fetch_engine.shutdown()
+
+    def make_api_request(self, url, params=None, max_retries=DEFAULT_MAX_RETRIES, use_cache=True):
         """Faz requisição à API com cache e rate limiting otimizado"""
-        cache_key = f"{url}_{str(params)}"
-        
-        current_time = time.time()
-        if cache_key in self.cache:
-            cached_data, cache_time = self.cache[cache_key]
-            if current_time - cache_time < 300:  # Cache válido por 5 minutos
-                return cached_data
-        
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < 0.5:
-            time.sleep(0.5 - time_since_last)
-        
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, params=params, timeout=8)
-                response.raise_for_status()
-                data = response.json()
-                
-                self.cache[cache_key] = (data, current_time)
-                self.last_request_time = time.time()
-                
-                return data
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Tentativa {attempt + 1} falhou: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(0.5)
-                else:
-                    print(f"Todas as tentativas falharam para {url}")
-                    return None
-
-    def clear_old_cache(self):
-        """Limpa cache antigo para evitar vazamento de memória"""
-        current_time = time.time()
-        keys_to_remove = []
-        
-        for key, (data, cache_time) in self.cache.items():
-            if current_time - cache_time > 600:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.cache[key]
-        
-        self.root.after(300000, self.clear_old_cache)
+        return self.fetcher.request(url, params, max_retries, use_cache)
 
     def force_clear_cache(self):
         """Força limpeza completa do cache"""
-        self.cache.clear()
-        self.last_request_time = 0
+        self.fetcher.clear()
+        self.history_sync.store.clear()
         print("Cache limpo forçadamente")
 
     def setup_database(self):
-        """Configura o banco de dados SQLite3"""
-        os.makedirs("database", exist_ok=True)
-        self.db_path = os.path.join("database", "crypto_history.db")
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
-
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS search_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                crypto_name TEXT NOT NULL,
-                search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                price_usd REAL,
-                price_brl REAL,
-                change_24h REAL
-            )
-        ''')
-        self.conn.commit()
+        """Configura o banco de dados SQLite3 (WAL, gravações em segundo plano)"""
+        self.history_store = get_history_store()
+        self.db_path = self.history_store.db_path
 
     def save_search_history(self, crypto_name, price_data):
         """Salva histórico de busca no banco de dados"""
@@ -117,28 +100,11 @@ class CryptoChartApp:
             usd_price = price_data.get("usd", 0)
             brl_price = price_data.get("brl", 0)
             change_24h = price_data.get("usd_24h_change", 0)
-            
-            self.cursor.execute('''
-                INSERT INTO search_history (crypto_name, price_usd, price_brl, change_24h)
-                VALUES (?, ?, ?, ?)
-            ''', (crypto_name, usd_price, brl_price, change_24h))
-            self.conn.commit()
-        except Exception as e:
-            print(f"Erro ao salvar histórico: {e}")
 
-    def get_search_history(self):
-        """Obtém histórico de buscas"""
-        try:
-            self.cursor.execute('''
-                SELECT crypto_name, search_date, price_usd, price_brl, change_24h
-                FROM search_history
-                ORDER BY search_date DESC
-                LIMIT 50
-            ''')
-            return self.cursor.fetchall()
+            # Só enfileira: o INSERT + commit roda fora da thread do Tk
+            self.history_store.add(crypto_name, usd_price, brl_price, change_24h)
         except Exception as e:
-            print(f"Erro ao buscar histórico: {e}")
-            return []
+            print(f"Erro ao salvar histórico: {e}")
 
     def show_history_window(self):
         """Mostra janela com histórico de consultas"""
@@ -190,61 +156,22 @@ class CryptoChartApp:
                         font=("Segoe UI", 11, "bold"),
                         relief="flat")
         style.map("Treeview", background=[("selected", "#585b70")])
-        
-        columns = ("Cripto", "Data", "Preço USD", "Preço BRL", "Variação 24h")
-        tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=20)
-        
-        # Configurar colunas
-        tree.column("Cripto", width=120, anchor="center")
-        tree.column("Data", width=180, anchor="center")
-        tree.column("Preço USD", width=180, anchor="center")
-        tree.column("Preço BRL", width=180, anchor="center")
-        tree.column("Variação 24h", width=150, anchor="center")
-        
-        for col in columns:
-            tree.heading(col, text=col)
-        
-        # Adicionar scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Buscar e exibir histórico
-        history_data = self.get_search_history()
-        for row in history_data:
-            crypto_name, search_date, price_usd, price_brl, change_24h = row
-            try:
-                date_obj = datetime.fromisoformat(search_date.replace('Z', '+00:00'))
-                formatted_date = date_obj.strftime("%d/%m/%Y %H:%M")
-            except Exception:
-                formatted_date = search_date
-            
-            formatted_usd = f"${price_usd:,.4f}" if price_usd else "N/A"
-            formatted_brl = f"R$ {price_brl:,.2f}" if price_brl else "N/A"
-            
-            # Colorir variação
-            if change_24h:
-                if change_24h >= 0:
-                    formatted_change = f"▲ {change_24h:+.2f}%"
-                    tree.tag_configure('positive', foreground='#a6e3a1')
-                    tags = ('positive',)
-                else:
-                    formatted_change = f"▼ {change_24h:+.2f}%"
-                    tree.tag_configure('negative', foreground='#f38ba8')
-                    tags = ('negative',)
-            else:
-                formatted_change = "N/A"
-                tags = ()
-            
-            tree.insert("", "end", values=(
-                crypto_name.upper(),
-                formatted_date,
-                formatted_usd,
-                formatted_brl,
-                formatted_change
-            ), tags=tags)
+
+        style.configure("TNotebook", background="#313244", borderwidth=0)
+        style.configure("TNotebook.Tab", background="#45475a", foreground="#cdd6f4", padding=(12, 4))
+        style.map("TNotebook.Tab", background=[("selected", "#585b70")])
+
+        notebook = ttk.Notebook(list_frame)
+        notebook.pack(fill="both", expand=True)
+        searches_tab = tk.Frame(notebook, bg="#313244")
+        stats_tab = tk.Frame(notebook, bg="#313244")
+        notebook.add(searches_tab, text="📋 Consultas")
+        notebook.add(stats_tab, text="📈 Estatísticas")
+
+        # Páginas carregadas sob demanda conforme a rolagem, com filtro por moeda
+        HistoryBrowser(searches_tab, self.history_store)
+        # Resumos diários mantidos a cada gravação
+        StatsView(stats_tab, self.history_store)
         
         # Botão fechar
         close_button = tk.Button(
@@ -364,15 +291,7 @@ class CryptoChartApp:
         quick_buttons_frame = tk.Frame(quick_frame, bg=card_color)
         quick_buttons_frame.pack(side="left", fill="x", expand=True)
 
-        popular_cryptos = [
-            ("₿ Bitcoin", "bitcoin"),
-            ("Ξ Ethereum", "ethereum"),
-            ("◎ Solana", "solana"),
-            ("₳ Cardano", "cardano"),
-            ("Ð Dogecoin", "dogecoin"),
-        ]
-
-        for name, crypto_id in popular_cryptos:
+        for name, crypto_id in POPULAR_CRYPTOS:
             tk.Button(
                 quick_buttons_frame,
                 text=name,
@@ -387,6 +306,35 @@ class CryptoChartApp:
                 cursor="hand2",
             ).pack(side="left", padx=4)
 
+        # Seletor de período
+        range_frame = tk.Frame(search_container, bg=card_color)
+        range_frame.pack(fill="x", pady=(10, 5))
+
+        tk.Label(
+            range_frame,
+            text="📅 Período:",
+            font=("Segoe UI", 11),
+            fg=text_color,
+            bg=card_color,
+        ).pack(side="left", padx=(0, 10))
+
+        for key, label, _ in TIME_RANGE_OPTIONS:
+            button = tk.Button(
+                range_frame,
+                text=label,
+                command=lambda k=key: self.change_range(k),
+                font=("Segoe UI", 10),
+                fg=text_color,
+                relief="flat",
+                activebackground="#6c7086",
+                padx=10,
+                pady=4,
+                cursor="hand2",
+            )
+            button.pack(side="left", padx=3)
+            self.range_buttons[key] = button
+        self.highlight_range_button()
+
         # Buttons frame
         buttons_frame = tk.Frame(search_container, bg=card_color)
         buttons_frame.pack(fill="x", pady=(15, 5))
@@ -413,6 +361,21 @@ class CryptoChartApp:
                 cursor="hand2",
             ).pack(side="left", padx=5, pady=5)
 
+        self.live_button = tk.Button(
+            buttons_frame,
+            text="📡 Ao vivo",
+            command=self.toggle_live,
+            font=("Segoe UI", 11, "bold"),
+            bg=highlight_color,
+            fg=text_color,
+            relief="flat",
+            activebackground="#6c7086",
+            padx=15,
+            pady=6,
+            cursor="hand2",
+        )
+        self.live_button.pack(side="left", padx=5, pady=5)
+
         # Info frame - Row 1, Column 1
         self.info_frame = tk.Frame(self.root, bg=card_color, bd=0, highlightbackground=highlight_color, highlightthickness=1)
         self.info_frame.grid(row=1, column=1, sticky="nsew", padx=(10, 20), pady=10)
@@ -466,24 +429,73 @@ class CryptoChartApp:
         self.root.bind('<Configure>', self.on_window_resize)
 
     def on_window_resize(self, event):
-        """Manipula o redimensionamento da janela"""
+        """Manipula o redimensionamento da janela (só age quando o arraste para)"""
         if event.widget == self.root:
-            new_width = min(event.width - 100, 1000)
-            self.info_label.configure(wraplength=new_width//2 - 50)
-            
-            if self.chart_canvas:
-                self.resize_chart()
+            self.pending_window_width = event.width
+            if self.resize_job:
+                self.root.after_cancel(self.resize_job)
+            self.resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self.apply_window_resize)
+
+    def apply_window_resize(self):
+        """Aplica o tamanho final da janela ao layout"""
+        self.resize_job = None
+        new_width = min(self.pending_window_width - 100, 1000)
+        self.info_label.configure(wraplength=new_width//2 - 50)
+
+    def highlight_range_button(self):
+        """Destaca o botão do período selecionado"""
+        for key, button in self.range_buttons.items():
+            selected = key == self.time_range
+            button.config(
+                bg="#89b4fa" if selected else "#585b70",
+                fg="#1e1e2e" if selected else "#cdd6f4",
+            )
 
-    def resize_chart(self):
-        """Redimensiona o gráfico para se adaptar à janela"""
-        if self.chart_canvas:
-            chart_width = max(self.chart_frame.winfo_width() - 40, 800)
-            chart_height = max(self.chart_frame.winfo_height() - 40, 500)
-            
-            if chart_width > 100 and chart_height > 100:
-                fig = self.chart_canvas.figure
-                fig.set_size_inches(chart_width/100, chart_height/100)
-                self.chart_canvas.draw()
+    def change_range(self, time_range):
+        """Troca o período do gráfico sem buscar de novo o preço atual"""
+        if time_range == self.time_range:
+            return
+        self.time_range = time_range
+        self.highlight_range_button()
+
+        if self.chart_view is None:
+            return
+
+        crypto = self.current_crypto
+        if self.last_price is None or self.last_price[0] != crypto:
+            # A busca dessa moeda ainda não terminou: refaz por completo
+            self.search_crypto()
+            return
+        current_price = self.last_price[1]
+
+        self.status_label.config(text="🔄 Carregando período...", fg="#f9e2af")
+        self.fetch_engine.new_generation()
+
+        # Com a série local em dia a pirâmide responde sem ir à rede
+        calls = [
+            (self.get_historical_data, crypto, time_range),
+            (self.get_ohlc_data, crypto, time_range),
+        ]
+        self.fetch_engine.submit_all(
+            calls,
+            on_done=lambda results: self.on_range_data(crypto, current_price, *results),
+            on_error=self.on_search_error,
+        )
+
+    def on_range_data(self, crypto, current_price, historical_data, ohlc_data=None):
+        """Redesenha o gráfico no novo período (thread do Tk); não é uma busca nova"""
+        try:
+            if historical_data is None or not len(historical_data):
+                self.show_error("❌ Erro ao buscar dados históricos. Aguarde um momento e tente novamente!.")
+                return
+
+            self.create_professional_chart(crypto, historical_data, current_price, ohlc_data)
+            self.status_label.config(
+                text=f"✅ Período atualizado | {rate_limiter.remaining()} req. disponíveis",
+                fg="#a6e3a1",
+            )
+        except Exception as e:
+            self.on_search_error(e)
 
     def quick_search(self, crypto_id):
         """Busca rápida para criptomoedas populares"""
@@ -493,23 +505,38 @@ class CryptoChartApp:
 
     def search_crypto(self):
         """Busca e exibe dados da criptomoeda"""
-        try:
-            crypto = self.search_entry.get().lower().strip()
-            if not crypto:
-                self.show_error("Por favor, digite o nome de uma criptomoeda")
-                return
+        crypto = self.search_entry.get().lower().strip()
+        if not crypto:
+            self.show_error("Por favor, digite o nome de uma criptomoeda")
+            return
 
-            self.current_crypto = crypto
-            self.status_label.config(text="🔄 Buscando dados...", fg="#f9e2af")
-            self.root.update()
+        self.current_crypto = crypto
+        self.status_label.config(text="🔄 Buscando dados...", fg="#f9e2af")
 
-            current_price = self.get_current_price(crypto)
+        # Uma nova busca substitui qualquer outra ainda em andamento
+        self.fetch_engine.new_generation()
+
+        # Os três endpoints são consultados ao mesmo tempo
+        calls = [
+            (self.get_current_price, crypto),
+            (self.get_historical_data, crypto, self.time_range),
+            (self.get_ohlc_data, crypto, self.time_range),
+        ]
+
+        self.fetch_engine.submit_all(
+            calls,
+            on_done=lambda results: self.on_search_data(crypto, *results),
+            on_error=self.on_search_error,
+        )
+
+    def on_search_data(self, crypto, current_price, historical_data, ohlc_data=None):
+        """Exibe o resultado de uma busca (executa na thread do Tk)"""
+        try:
             if not current_price:
                 self.show_error("❌ Criptomoeda não encontrada ou erro na API")
                 return
 
-            historical_data = self.get_historical_data(crypto)
-            if not historical_data or not historical_data.get("prices"):
+            if historical_data is None or not len(historical_data):
                 self.show_error("❌ Erro ao buscar dados históricos. Aguarde um momento e tente novamente!.")
                 return
 
@@ -518,75 +545,159 @@ class CryptoChartApp:
             except Exception as e:
                 print(f"Erro ao salvar histórico: {e}")
 
+            self.last_price = (crypto, current_price)
             self.update_info(crypto, current_price)
             self.chart_type = "candlestick"
-            self.create_professional_chart(crypto, historical_data, current_price)
+            self.create_professional_chart(crypto, historical_data, current_price, ohlc_data)
 
-            self.status_label.config(text="✅ Dados atualizados com sucesso", fg="#a6e3a1")
+            self.status_label.config(
+                text=f"✅ Dados atualizados com sucesso | {rate_limiter.remaining()} req. disponíveis",
+                fg="#a6e3a1",
+            )
             
         except Exception as e:
-            print(f"Erro geral na busca: {e}")
-            self.show_error("❌ Erro inesperado. Tente novamente.")
-            self.status_label.config(text="❌ Erro", fg="#f38ba8")
+            self.on_search_error(e)
+
+    def on_search_error(self, error):
+        """Trata erros inesperados da busca"""
+        print(f"Erro geral na busca: {error}")
+        self.show_error("❌ Erro inesperado. Tente novamente.")
+        self.status_label.config(text="❌ Erro", fg="#f38ba8")
 
     def refresh_chart(self):
         """Atualiza o gráfico atual"""
         if self.current_crypto:
             self.search_crypto()
 
-    def get_current_price(self, crypto_id):
+    def live_interval_ms(self):
+        """Intervalo do modo ao vivo, nunca acima da fatia do orçamento reservada a ele"""
+        floor = 60 / (rate_limiter.per_minute * LIVE_BUDGET_SHARE)
+        return int(max(LIVE_INTERVAL, floor) * 1000)
+
+    def toggle_live(self):
+        """Liga/desliga o acompanhamento ao vivo da moeda atual"""
+        if self.live_job is not None:
+            self.stop_live()
+            self.status_label.config(text="⏸️ Modo ao vivo desligado", fg="#cdd6f4")
+            return
+
+        self.live_button.config(text="⏹️ Parar ao vivo", bg="#a6e3a1", fg="#1e1e2e")
+        self.status_label.config(
+            text=f"📡 Ao vivo: atualizando a cada {self.live_interval_ms() // 1000}s",
+            fg="#a6e3a1",
+        )
+        self.live_job = self.root.after(0, self.live_tick)
+
+    def stop_live(self):
+        if self.live_job is not None:
+            try:
+                self.root.after_cancel(self.live_job)
+            except Exception:
+                pass
+            self.live_job = None
+        if self.live_button is not None and self.live_button.winfo_exists():
+            self.live_button.config(text="📡 Ao vivo", bg="#585b70", fg="#cdd6f4")
+
+    def live_tick(self):
+        """Uma consulta pequena a /simple/price por intervalo"""
+        if self.fetch_engine.closed:
+            self.live_job = None
+            return
+        self.live_job = self.root.after(self.live_interval_ms(), self.live_tick)
+
+        # Sem token livre o tick é pulado em vez de atrasar as buscas do usuário
+        if self.last_price is None or rate_limiter.remaining() < 1:
+            return
+
+        # A moeda do gráfico exibido; current_crypto já muda quando outra busca começa
+        crypto = self.last_price[0]
+        self.fetch_engine.submit(
+            self.get_current_price,
+            crypto,
+            False,
+            on_done=lambda price: self.on_live_price(crypto, price),
+            on_error=lambda e: print(f"Erro no modo ao vivo: {e}"),
+        )
+
+    def on_live_price(self, crypto, price_data):
+        """Atualiza o painel e só o último ponto/candle do gráfico (thread do Tk)"""
+        if not price_data or self.last_price is None or crypto != self.last_price[0] or self.live_job is None:
+            return
+
+        try:
+            self.last_price = (crypto, price_data)
+            self.update_info(crypto, price_data)
+
+            usd_price = price_data.get("usd")
+            if self.chart_view is not None and usd_price is not None:
+                updated_at = price_data.get("last_updated_at") or time.time()
+                self.chart_view.apply_tick(int(updated_at * 1000), usd_price)
+
+            self.status_label.config(
+                text=f"📡 Ao vivo: {datetime.now():%H:%M:%S} | {rate_limiter.remaining()} req. disponíveis",
+                fg="#a6e3a1",
+            )
+        except Exception as e:
+            # Um tick ruim é descartado; o próximo tenta de novo
+            print(f"Erro no modo ao vivo: {e}")
+
+    def get_current_price(self, crypto_id, use_cache=True):
         """Busca preço atual da criptomoeda"""
-        url = f"https://api.coingecko.com/api/v3/simple/price"
+        url = "/simple/price"
         params = {
             "ids": crypto_id,
             "vs_currencies": "usd,brl",
             "include_24hr_change": "true",
             "include_market_cap": "true",
             "include_24hr_vol": "true",
+            "include_last_updated_at": "true",
         }
 
-        data = self.make_api_request(url, params)
+        data = self.make_api_request(url, params, use_cache=use_cache)
+        if data and not use_cache:
+            # O preço ao vivo também serve às próximas buscas
+            self.cache.set(canonical_key(url, params), data)
         if data and crypto_id in data:
             return data[crypto_id]
         return None
 
-    def get_historical_data(self, crypto_id, days=30):
-        """Busca dados históricos da criptomoeda"""
-        url = f"https://api.coingecko.com/api/v3/coins/{crypto_id}/market_chart"
-        params = {"vs_currency": "usd", "days": days, "interval": "daily"}
-
-        data = self.make_api_request(url, params)
-        if data:
-            return {
-                "prices": data.get("prices", []),
-                "market_caps": data.get("market_caps", []),
-                "total_volumes": data.get("total_volumes", []),
-            }
-        return None
+    def get_historical_data(self, crypto_id, time_range=DEFAULT_TIME_RANGE):
+        """Busca dados históricos do período (só o trecho que falta localmente)"""
+        try:
+            rows = self.history_sync.range_buckets(crypto_id, time_range)
+        except Exception as e:
+            print(f"Erro ao buscar dados históricos: {e}")
+            return None
+        if not rows:
+            return None
 
-    def get_ohlc_data(self, crypto_id, days=30):
-        """Busca dados OHLC para candlestick"""
-        url = f"https://api.coingecko.com/api/v3/coins/{crypto_id}/ohlc"
-        params = {"vs_currency": "usd", "days": days}
+        # Conversão vetorizada, feita uma única vez na thread de background
+        columns = np.asarray(rows, dtype=np.float64)
+        return PriceSeries(columns[:, 1], columns[:, 5], columns[:, 7], columns[:, 6])
 
-        data = self.make_api_request(url, params)
-        if data:
-            ohlc_data = []
-            for candle in data:
-                timestamp, open_price, high, low, close = candle
-                date = datetime.fromtimestamp(timestamp / 1000)
-                ohlc_data.append([date, open_price, high, low, close])
+    def get_ohlc_data(self, crypto_id, time_range=DEFAULT_TIME_RANGE):
+        """Busca candles do período na pirâmide OHLC (só o trecho que falta localmente)"""
+        try:
+            rows = self.history_sync.range_buckets(crypto_id, time_range, candles=True)
+        except Exception as e:
+            print(f"Erro ao buscar dados OHLC: {e}")
+            return None
+        if not rows:
+            return None
 
-            return ohlc_data
-        return None
+        # Cada candle fica no centro do seu bucket
+        half_bucket = PYRAMID_LEVELS[TIME_RANGES[time_range][2]] / 2
+        columns = np.asarray(rows, dtype=np.float64)
+        return OHLCSeries(columns[:, 0] + half_bucket, *columns[:, 2:6].T)
 
     def update_info(self, crypto_name, price_data):
         """Atualiza informações da criptomoeda"""
-        usd_price = price_data.get("usd", 0)
-        brl_price = price_data.get("brl", 0)
-        change_24h = price_data.get("usd_24h_change", 0)
-        market_cap = price_data.get("usd_market_cap", 0)
-        volume_24h = price_data.get("usd_24h_vol", 0)
+        # A API às vezes devolve null nesses campos
+        usd_price = price_data.get("usd") or 0
+        brl_price = price_data.get("brl") or 0
+        change_24h = price_data.get("usd_24h_change") or 0
+        market_cap = price_data.get("usd_market_cap") or 0
+        volume_24h = price_data.get("usd_24h_vol") or 0
 
         def format_number(num):
             if num >= 1e12:
@@ -613,252 +724,56 @@ class CryptoChartApp:
 
         self.info_label.config(text=info_text, fg="#cdd6f4")
 
-    def create_professional_chart(self, crypto_name, data, current_price):
+    def create_professional_chart(self, crypto_name, data, current_price, ohlc_data=None):
         """Cria gráfico profissional com múltiplas visualizações"""
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        if hasattr(self, 'chart_canvas') and self.chart_canvas:
-            try:
-                self.chart_canvas.get_tk_widget().destroy()
-                self.chart_canvas = None
-            except Exception as e:
-                print(f"Erro ao destruir canvas: {e}")
-
-        prices = data["prices"]
-        volumes = data["total_volumes"]
-
-        if not prices:
+        if not len(data):
             self.show_error("❌ Dados de preços não disponíveis")
             return
 
-        # Obter dimensões do frame
-        chart_width = max(self.chart_frame.winfo_width() - 40, 800)
-        chart_height = max(self.chart_frame.winfo_height() - 40, 500)
-        
-        fig_width = max(chart_width / 100, 10)
-        fig_height = max(chart_height / 100, 6)
+        # A figura é criada uma única vez; depois só os dados são trocados
+        if self.chart_view is None:
+            chart_width = max(self.chart_frame.winfo_width() - 40, 800)
+            chart_height = max(self.chart_frame.winfo_height() - 40, 500)
+            self.chart_view = ChartView(self.chart_frame, chart_width, chart_height)
+            self.chart_canvas = self.chart_view.canvas
 
-        # Criar figura com tamanho responsivo
-        fig = plt.figure(figsize=(fig_width, fig_height), facecolor="#1e1e2e")
-        
-        # Definir layout de grade para os subplots
-        gs = plt.GridSpec(2, 1, height_ratios=[3, 1], hspace=0.1)
-        ax1 = fig.add_subplot(gs[0])
-        ax2 = fig.add_subplot(gs[1], sharex=ax1)
+        _, label, date_format = next(o for o in TIME_RANGE_OPTIONS if o[0] == self.time_range)
+        self.chart_view.set_period(label, date_format)
 
-        ax1.set_facecolor("#313244")
-        ax2.set_facecolor("#313244")
+        # Nível de detalhe: não desenhar mais pontos do que a largura em pixels comporta
+        width_px = max(self.chart_frame.winfo_width() - 40, 800)
 
         candlestick_ok = False
-        if MPLFINANCE_AVAILABLE:
-            try:
-                self.create_candlestick_chart(ax1, crypto_name, fig_width)
-                if not ax1.get_lines() and not ax1.collections:
-                    print("Candlestick vazio, fallback para linha.")
-                else:
-                    candlestick_ok = True
-            except Exception as e:
-                print(f"Erro ao criar candlestick: {e}")
-        if not candlestick_ok:
-            self.create_line_chart(ax1, crypto_name, prices, current_price, fig_width)
-
-        if volumes:
-            bars = ax2.bar(
-                [datetime.fromtimestamp(p[0] / 1000) for p in prices],
-                [v[1] for v in volumes],
-                color="#fab387",
-                alpha=0.7,
-                width=0.8,
-                label="Volume 24h",
-            )
-
-            volume_values = [v[1] for v in volumes]
-            avg_volume = np.mean(volume_values)
-            for i, (bar, vol) in enumerate(zip(bars, volume_values)):
-                if vol > avg_volume * 1.5:
-                    bar.set_color("#a6e3a1")
-                    bar.set_alpha(0.9)
-
-            ax2.set_ylabel("Volume (USD)", fontsize=10, color="#cdd6f4")
-            ax2.tick_params(colors="#cdd6f4", labelsize=9)
-            ax2.grid(True, alpha=0.2, color="#585b70")
-            ax2.legend(
-                loc="upper left",
-                facecolor="#45475a",
-                edgecolor="none",
-                labelcolor="#cdd6f4",
-                fontsize=9,
-            )
-
-            ax2.yaxis.set_major_formatter(
-                plt.FuncFormatter(
-                    lambda x, p: f"${x/1e9:.1f}B" if x >= 1e9 else f"${x/1e6:.1f}M"
-                )
+        try:
+            candlestick_ok = self.create_candlestick_chart(
+                crypto_name, downsample_candles(ohlc_data, width_px)
             )
+        except Exception as e:
+            print(f"Erro ao criar candlestick: {e}")
+        if not candlestick_ok:
+            self.create_line_chart(crypto_name, downsample_line(data, width_px), current_price)
 
-        ax2.set_xlabel("Data", fontsize=10, color="#cdd6f4")
-
-        # Formatação das datas
-        date_formatter = DateFormatter("%d/%m")
-        ax1.xaxis.set_major_formatter(date_formatter)
-        ax2.xaxis.set_major_formatter(date_formatter)
-
-        # Rotacionar labels das datas
-        plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha="right")
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha="right")
-
-        # Ajustar layout
-        plt.tight_layout(pad=3.0)
-
-        # Adicionar ao Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-
-        self.chart_canvas = canvas
+        self.chart_view.show_volume(downsample_volume(data, width_px))
+        self.chart_view.redraw()
 
-    def create_candlestick_chart(self, ax, crypto_name, fig_width):
+    def create_candlestick_chart(self, crypto_name, ohlc_data):
         """Cria gráfico de candlestick"""
-        if not MPLFINANCE_AVAILABLE:
-            print("mplfinance não disponível, usando gráfico de linha")
-            return
-
-        ohlc_data = self.get_ohlc_data(self.current_crypto)
-        if not ohlc_data:
+        if ohlc_data is None or not len(ohlc_data):
             print("Dados OHLC não disponíveis, usando gráfico de linha")
-            return
+            return False
 
-        dates = [candle[0] for candle in ohlc_data]
-        ohlc_values = []
-        for candle in ohlc_data:
-            date, open_price, high, low, close = candle
-            date_num = mpdates.date2num(date)
-            ohlc_values.append([date_num, open_price, high, low, close])
+        return self.chart_view.show_candles(crypto_name, ohlc_data)
 
-        try:
-            candlestick_ohlc(
-                ax,
-                ohlc_values,
-                width=0.6,
-                colorup="#a6e3a1",
-                colordown="#f38ba8",
-                alpha=0.9,
-            )
-            
-            ax.set_title(f"{crypto_name.upper()} - Candlestick Chart (USD)", 
-                        fontsize=12, 
-                        color="#89b4fa", 
-                        pad=20,
-                        y=1.05)
-            ax.set_ylabel("Preço (USD)", fontsize=10, color="#cdd6f4")
-            ax.tick_params(colors="#cdd6f4", labelsize=9)
-            ax.grid(True, alpha=0.2, color="#585b70")
-            
-            # Adicionar preço médio
-            avg_price = np.mean([candle[4] for candle in ohlc_data])
-            ax.axhline(
-                y=avg_price,
-                color="#f9e2af",
-                linestyle="--",
-                linewidth=1,
-                alpha=0.7,
-                label=f"Média: ${avg_price:.2f}"
-            )
-            
-            ax.legend(
-                loc="upper left",
-                facecolor="#45475a",
-                edgecolor="none",
-                labelcolor="#cdd6f4",
-                fontsize=9,
-            )
-            
-            # Formatar eixo Y
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f"${x:,.2f}"))
-            
-        except Exception as e:
-            print(f"Erro ao desenhar candlestick: {e}")
-            return
-
-    def create_line_chart(self, ax, crypto_name, prices, current_price, fig_width):
+    def create_line_chart(self, crypto_name, series, current_price):
         """Cria gráfico de linha"""
-        dates = [datetime.fromtimestamp(p[0] / 1000) for p in prices]
-        price_values = [p[1] for p in prices]
-
-        line = ax.plot(
-            dates,
-            price_values,
-            linewidth=2.5,
-            color="#89b4fa",
-            label=f"{crypto_name.upper()} Price",
-            alpha=0.9,
-        )[0]
-
-        ax.fill_between(dates, price_values, alpha=0.2, color="#89b4fa")
-
-        max_price = max(price_values)
-        min_price = min(price_values)
-        max_idx = price_values.index(max_price)
-        min_idx = price_values.index(min_price)
-
-        ax.scatter(
-            [dates[max_idx]],
-            [max_price],
-            color="#a6e3a1",
-            s=100,
-            zorder=5,
-            label=f"Máximo: ${max_price:.2f}",
-        )
-        ax.scatter(
-            [dates[min_idx]],
-            [min_price],
-            color="#f38ba8",
-            s=100,
-            zorder=5,
-            label=f"Mínimo: ${min_price:.2f}",
-        )
-
-        current_usd = current_price.get("usd", price_values[-1])
-        ax.axhline(
-            y=current_usd,
-            color="#f9e2af",
-            linestyle="--",
-            linewidth=1.5,
-            alpha=0.8,
-            label=f"Atual: ${current_usd:.2f}",
-        )
-
-        ax.set_title(
-            f"{crypto_name.upper()} - Price Chart (30 days)",
-            fontsize=12,
-            color="#cdd6f4",
-            pad=20,
-            y=1.05,
-        )
-        ax.set_ylabel("Preço (USD)", fontsize=10, color="#cdd6f4")
-        ax.tick_params(colors="#cdd6f4", labelsize=9)
-        ax.grid(True, alpha=0.2, color="#585b70")
-        ax.legend(
-            loc="upper left",
-            facecolor="#45475a",
-            edgecolor="none",
-            labelcolor="#cdd6f4",
-            fontsize=9,
-        )
-
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f"${x:,.2f}"))
+        current_usd = current_price.get("usd", series.prices[-1])
+        self.chart_view.show_line(crypto_name, series, current_usd)
 
     def show_error(self, message):
         """Exibe mensagem de erro"""
         self.info_label.config(text=message, fg="#f38ba8")
         self.status_label.config(text="❌ Erro", fg="#f38ba8")
 
-    def __del__(self):
-        """Destrutor para fechar conexão com banco de dados"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
-
 
 def mostrar_tela_cotacao_melhorada(root, voltar_tela=None):
     """Função principal para mostrar a tela de cotação melhorada"""
@@ -1,31 +1,90 @@
 import tkinter as tk
+from collections import OrderedDict
 from PIL import Image, ImageTk
 import os
 
 
+# Espera (ms) após o último redimensionamento antes do redimensionamento de alta qualidade
+REDIMENSIONAR_DEBOUNCE_MS = 150
+
+# Quantos tamanhos já renderizados em alta qualidade ficam guardados
+TAMANHOS_EM_CACHE = 4
+
+_imagem_base = None
+_cache_fundos = OrderedDict()  # (largura, altura) -> PhotoImage
+
+
+def carregar_imagem_base():
+    """Imagem de fundo já com a transparência aplicada, montada uma única vez"""
+    global _imagem_base
+    if _imagem_base is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        caminho_imagem = os.path.join(base_dir, "..", "assets", "fundo.png")
+
+        try:
+            imagem = Image.open(caminho_imagem).convert("RGBA")
+        except FileNotFoundError:
+            imagem = Image.new("RGBA", (800, 600), color="#1e213d")
+
+        alpha = 0.3
+        imagem.putalpha(Image.new("L", imagem.size, int(255 * alpha)))
+        _imagem_base = imagem
+    return _imagem_base
+
+
+def fundo_alta_qualidade(tamanho):
+    """PhotoImage em LANCZOS para o tamanho, reaproveitando os tamanhos recentes"""
+    bg_image = _cache_fundos.get(tamanho)
+    if bg_image is not None:
+        _cache_fundos.move_to_end(tamanho)
+        return bg_image
+
+    bg_image = ImageTk.PhotoImage(carregar_imagem_base().resize(tamanho, Image.LANCZOS))
+    _cache_fundos[tamanho] = bg_image
+    while len(_cache_fundos) > TAMANHOS_EM_CACHE:
+        _cache_fundos.popitem(last=False)
+    return bg_image
+
+
 def mostrar_tela_inicial(root, mudar_tela):
     for widget in root.winfo_children():
         widget.destroy()
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    caminho_imagem = os.path.join(base_dir, "..", "assets", "fundo.png")
+    imagem_base = carregar_imagem_base()
+    estado = {"tamanho": None, "job": None}
 
-    try:
-        imagem_fundo_original = Image.open(caminho_imagem).convert("RGBA")
-    except FileNotFoundError:
-        imagem_fundo_original = Image.new("RGBA", (800, 600), color="#1e213d")
+    def mostrar_fundo(bg_image, tamanho):
+        fundo_label.config(image=bg_image)
+        fundo_label.image = bg_image
+        estado["tamanho"] = tamanho
 
-    alpha = 0.3
-    alpha_layer = Image.new("L", imagem_fundo_original.size, int(255 * alpha))
-    imagem_fundo_original.putalpha(alpha_layer)
+    def aplicar_alta_qualidade():
+        estado["job"] = None
+        if not fundo_label.winfo_exists():
+            return
+        tamanho = (max(root.winfo_width(), 1), max(root.winfo_height(), 1))
+        mostrar_fundo(fundo_alta_qualidade(tamanho), tamanho)
 
     def atualizar_imagem_fundo(event=None):
-        imagem_resized = imagem_fundo_original.resize(
-            (root.winfo_width(), root.winfo_height()), Image.LANCZOS
-        )
-        bg_image = ImageTk.PhotoImage(imagem_resized)
-        fundo_label.config(image=bg_image)
-        fundo_label.image = bg_image
+        if event is not None and event.widget is not root:
+            return
+        if not fundo_label.winfo_exists():
+            return
+
+        tamanho = (max(root.winfo_width(), 1), max(root.winfo_height(), 1))
+        if tamanho == estado["tamanho"]:
+            return
+
+        if estado["job"]:
+            root.after_cancel(estado["job"])
+        if tamanho in _cache_fundos:
+            mostrar_fundo(fundo_alta_qualidade(tamanho), tamanho)
+            return
+
+        # Durante o arraste usa um filtro rápido; o LANCZOS só roda quando o tamanho para de mudar
+        rapida = ImageTk.PhotoImage(imagem_base.resize(tamanho, Image.NEAREST))
+        mostrar_fundo(rapida, tamanho)
+        estado["job"] = root.after(REDIMENSIONAR_DEBOUNCE_MS, aplicar_alta_qualidade)
 
     fundo_label = tk.Label(root)
     fundo_label.place(x=0, y=0, relwidth=1, relheight=1)
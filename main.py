@@ -1,27 +1,59 @@
 import tkinter as tk
+import importlib
 import os
+import sys
+import threading
 from gui.tela_inicial import mostrar_tela_inicial
-from gui.tela_cotacao import mostrar_tela_cotacao_melhorada
+
+# A tela de cotação (matplotlib, numpy, requests...) só é importada quando for usada
+TELA_COTACAO = "gui.tela_cotacao"
+
+# Espera (ms) depois da tela inicial aparecer antes de pré-carregar a tela de cotação
+PRE_CARREGAR_APOS_MS = 500
+
+
+def pre_carregar_tela_cotacao():
+    """Importa a tela de cotação numa thread de fundo enquanto a tela inicial está aberta"""
+    def importar():
+        try:
+            importlib.import_module(TELA_COTACAO)
+        except Exception as e:
+            print(f"Erro ao pré-carregar a tela de cotação: {e}")
+
+    threading.Thread(target=importar, name="pre-carregar", daemon=True).start()
 
 
 def main():
+    # "serve" sobe o servidor local de cotações (ver server.py)
+    if sys.argv[1:2] == ["serve"]:
+        import server
+        sys.exit(server.main(sys.argv[2:]))
+
+    # Com argumentos o app roda sem interface (ver cli.py)
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
+
     app = tk.Tk()
     app.title("CryptoApp")
     app.geometry("600x600")
 
     # CAMINHO PARA O ÍCONE (certifique-se que o arquivo iconB.ico está em assets/)
     icone_path = os.path.join("assets", "bitcoin.ico")
-    app.iconbitmap(icone_path) 
+    app.iconbitmap(icone_path)
 
 
     def ir_para_cotacao():
-        
-        mostrar_tela_cotacao_melhorada(app, voltar_para_inicial)
+        # Se o pré-carregamento ainda estiver em andamento, o import espera por ele
+        tela_cotacao = importlib.import_module(TELA_COTACAO)
+        tela_cotacao.mostrar_tela_cotacao_melhorada(app, voltar_para_inicial)
 
     def voltar_para_inicial():
         mostrar_tela_inicial(app, ir_para_cotacao)
 
     mostrar_tela_inicial(app, ir_para_cotacao)
+    if os.environ.get("CRYPTOAPP_PRELOAD", "1") != "0":
+        app.after(PRE_CARREGAR_APOS_MS, pre_carregar_tela_cotacao)
     app.mainloop()
 
 
@@ -0,0 +1,204 @@
+"""Servidor local de cotações: vários clientes, uma única busca na CoinGecko.
+
+Uso: python main.py serve [--host 127.0.0.1] [--port 8000] [--upstream URL]
+
+Endpoints simplificados:
+    /price?ids=bitcoin,ethereum&vs_currencies=usd,brl
+    /history?id=bitcoin&days=30&vs_currency=usd
+    /ohlc?id=bitcoin&days=30&vs_currency=usd
+
+Os caminhos da CoinGecko (/simple/price, /coins/{id}/market_chart, /market_chart/range
+e /ohlc) também são aceitos, então o app pode usá-lo como COINGECKO_BASE_URL.
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from api import http_client
+from api.cache import ttl_for
+from api.fetcher import get_cached_fetcher
+from api.timeseries import range_window
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# Threads para as buscas bloqueantes; chaves iguais são agrupadas pelo single-flight
+FETCH_WORKERS = 16
+
+# Tempo máximo (s) esperando o cabeçalho de uma requisição numa conexão keep-alive
+IDLE_TIMEOUT = 30
+MAX_HEADER_LINES = 100
+
+# Caminhos da CoinGecko repassados como estão
+UPSTREAM_PATHS = [
+    re.compile(r"^/simple/price$"),
+    re.compile(r"^/coins/[a-z0-9-]+/market_chart$"),
+    re.compile(r"^/coins/[a-z0-9-]+/market_chart/range$"),
+    re.compile(r"^/coins/[a-z0-9-]+/ohlc$"),
+]
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 502: "Bad Gateway"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def resolve(path, params):
+    """Traduz o caminho pedido em (caminho da CoinGecko, parâmetros), ou None se não existir"""
+    path = "/" + path.strip("/")
+    if UPSTREAM_PATHS[2].match(path):
+        # Cada cliente manda from/to do próprio relógio; alinhados, viram uma só chave
+        try:
+            from_s, to_s = range_window(float(params["from"]), float(params["to"]))
+        except (KeyError, ValueError):
+            raise BadRequest("parâmetros 'from' e 'to' obrigatórios")
+        return path, {**params, "from": from_s, "to": to_s}
+    if any(pattern.match(path) for pattern in UPSTREAM_PATHS):
+        return path, params
+
+    if path == "/price":
+        if not params.get("ids"):
+            raise BadRequest("parâmetro 'ids' obrigatório")
+        return "/simple/price", {"vs_currencies": "usd,brl", **params}
+
+    if path in ("/history", "/ohlc"):
+        coin_id = params.pop("id", "").strip().lower()
+        if not re.fullmatch(r"[a-z0-9-]+", coin_id):
+            raise BadRequest("parâmetro 'id' obrigatório")
+        params = {"vs_currency": "usd", "days": "30", **params}
+        endpoint = "market_chart" if path == "/history" else "ohlc"
+        return f"/coins/{coin_id}/{endpoint}", params
+
+    return None
+
+
+class QuoteServer:
+    """Servidor HTTP/1.1 mínimo sobre asyncio, atendido pelo CachedFetcher compartilhado"""
+
+    def __init__(self, fetcher=None, workers=FETCH_WORKERS):
+        self.fetcher = fetcher or get_cached_fetcher()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="server")
+        self.requests = 0
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "requisição inválida"}, keep_alive=False)
+                    break
+
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    and (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive")
+                )
+                status, body, max_age = await self.dispatch(method, target)
+                await self.respond(writer, status, body, keep_alive, max_age)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def dispatch(self, method, target):
+        """(status, corpo JSON, max-age) para uma requisição"""
+        if method != "GET":
+            return 405, {"error": "só GET é aceito"}, 0
+
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        if url.path.rstrip("/") in ("", "/ping"):
+            return 200, {"status": "ok", "requests": self.requests}, 0
+
+        try:
+            resolved = resolve(url.path, params)
+        except BadRequest as e:
+            return 400, {"error": str(e)}, 0
+        if resolved is None:
+            return 404, {"error": "endpoint desconhecido"}, 0
+
+        self.requests += 1
+        path, params = resolved
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(self.executor, self.fetcher.request, path, params)
+        if data is None:
+            return 502, {"error": "falha ao consultar a CoinGecko"}, 0
+        return 200, data, ttl_for(path, params)
+
+    async def respond(self, writer, status, body, keep_alive, max_age=0):
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(payload)}",
+            f"Cache-Control: max-age={max_age}" if max_age else "Cache-Control: no-store",
+            "Connection: keep-alive" if keep_alive else "Connection: close",
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        address = ", ".join(str(sock.getsockname()[:2]) for sock in server.sockets)
+        print(f"Servidor de cotações em {address} -> {http_client.get_base_url()}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Servidor local de cotações")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--upstream", help="URL da API de origem (padrão: COINGECKO_BASE_URL ou a CoinGecko)")
+    args = parser.parse_args(argv)
+
+    if args.upstream:
+        http_client.set_base_url(args.upstream)
+
+    quote_server = QuoteServer()
+    started = time.time()
+    try:
+        asyncio.run(quote_server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        quote_server.close()
+        print(
+            f"{quote_server.requests} requisições atendidas em {time.time() - started:.0f}s",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
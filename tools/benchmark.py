@@ -0,0 +1,344 @@
+"""Benchmarks do CryptoApp contra um stub local da CoinGecko; resultados em JSON.
+
+Uso: python tools/benchmark.py [--output bench_results.json] [--baseline anterior.json]
+                               [--latency-ms 50] [--points 0] [--error-rate 0.0] [--quick]
+
+Mede os estágios de search_crypto (preço, histórico, OHLC, gráfico), os caminhos de
+cache (miss, memória, disco), o tempo de create_professional_chart de 30 a 100k pontos
+e a vazão do histórico de buscas em SQLite. Tudo usa bancos temporários: os arquivos
+em database/ não são tocados. Com --baseline, métricas mais de 20% piores são listadas.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from tools.coingecko_stub import CoinGeckoStub, StubConfig  # noqa: E402
+
+DEFAULT_OUTPUT = "bench_results.json"
+
+# Formato do arquivo de resultados; muda se as métricas forem renomeadas
+RESULTS_VERSION = 1
+
+# Piora (fração) a partir da qual uma métrica conta como regressão
+REGRESSION_THRESHOLD = 0.2
+
+RENDER_POINTS = (30, 1_000, 10_000, 100_000)
+CHART_SIZE_PX = (1000, 600)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(samples_s):
+    """Estatísticas (ms) de uma lista de durações em segundos"""
+    samples = sorted(s * 1000 for s in samples_s)
+    return {
+        "unit": "ms",
+        "runs": len(samples),
+        "min": round(samples[0], 3),
+        "median": round(statistics.median(samples), 3),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean": round(statistics.fmean(samples), 3),
+    }
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+class HeadlessFrame:
+    """Substitui o chart_frame do Tk: só informa o tamanho"""
+
+    def __init__(self, width_px, height_px):
+        self.width_px = width_px
+        self.height_px = height_px
+
+    def winfo_width(self):
+        return self.width_px
+
+    def winfo_height(self):
+        return self.height_px
+
+
+def headless_app(fetcher, history_store, timeseries_store, width_px, height_px):
+    """CryptoChartApp sem Tk: os métodos medidos são os da própria tela de cotação"""
+    from api.timeseries import DEFAULT_TIME_RANGE, IncrementalHistory
+    from gui.chart_view import ChartView
+    from gui.tela_cotacao import CryptoChartApp
+
+    class HeadlessApp(CryptoChartApp):
+        def __init__(self):
+            self.time_range = DEFAULT_TIME_RANGE
+            self.fetcher = fetcher
+            self.cache = fetcher.cache
+            self.response_cache = fetcher.response_cache
+            self.history_store = history_store
+            self.history_sync = IncrementalHistory(
+                lambda url, params: self.make_api_request(url, params, use_cache=False),
+                store=timeseries_store,
+            )
+            # O chart_frame tem 40 px de margem em volta do gráfico
+            self.chart_frame = HeadlessFrame(width_px + 40, height_px + 40)
+            self.chart_view = ChartView(None, width_px, height_px)
+            self.chart_canvas = self.chart_view.canvas
+
+        def show_error(self, message):
+            raise RuntimeError(message)
+
+    return HeadlessApp()
+
+
+def bench_search(app, coins, rounds):
+    """Estágios de search_crypto, em sequência e em paralelo, com stores vazios (frio) e cheios (quente)"""
+    results = {}
+    for phase in ("cold", "warm"):
+        stages = {"price": [], "history": [], "ohlc": [], "save": [], "chart": [], "total": []}
+        for _ in range(1 if phase == "cold" else rounds):
+            for crypto in coins:
+                started = time.perf_counter()
+                elapsed, price = timed(app.get_current_price, crypto)
+                stages["price"].append(elapsed)
+                elapsed, history = timed(app.get_historical_data, crypto, app.time_range)
+                stages["history"].append(elapsed)
+                elapsed, ohlc = timed(app.get_ohlc_data, crypto, app.time_range)
+                stages["ohlc"].append(elapsed)
+                if not price or history is None:
+                    raise RuntimeError(f"busca de {crypto} sem dados do stub")
+                elapsed, _ = timed(app.save_search_history, crypto, price)
+                stages["save"].append(elapsed)
+                elapsed, _ = timed(app.create_professional_chart, crypto, history, price, ohlc)
+                stages["chart"].append(elapsed)
+                stages["total"].append(time.perf_counter() - started)
+        for stage, samples in stages.items():
+            results[f"search.{phase}.{stage}"] = summarize(samples)
+
+    # Como na tela: os três endpoints ao mesmo tempo, e o gráfico quando todos chegam
+    app.fetcher.clear()
+    app.history_sync.store.clear()
+    samples = []
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        for crypto in coins:
+            started = time.perf_counter()
+            futures = [
+                pool.submit(app.get_current_price, crypto),
+                pool.submit(app.get_historical_data, crypto, app.time_range),
+                pool.submit(app.get_ohlc_data, crypto, app.time_range),
+            ]
+            price, history, ohlc = (future.result() for future in futures)
+            app.create_professional_chart(crypto, history, price, ohlc)
+            samples.append(time.perf_counter() - started)
+    results["search.cold.parallel_total"] = summarize(samples)
+    return results
+
+
+def bench_cache(fetcher_factory, requests_count):
+    """Miss (rede), hit em memória e hit em disco de CachedFetcher"""
+    fetcher = fetcher_factory()
+    keys = [("/simple/price", {"ids": f"coin-{i}", "vs_currencies": "usd,brl"}) for i in range(requests_count)]
+
+    miss = [timed(fetcher.request, url, params)[0] for url, params in keys]
+    memory_hit = [timed(fetcher.request, url, params)[0] for url, params in keys]
+
+    # Outra instância com memória vazia e o mesmo arquivo: só o disco tem as respostas
+    disk_fetcher = fetcher_factory(response_cache=fetcher.response_cache)
+    disk_hit = [timed(disk_fetcher.request, url, params)[0] for url, params in keys]
+    fetcher.shutdown()
+    disk_fetcher.shutdown()
+    return {
+        "cache.miss": summarize(miss),
+        "cache.memory_hit": summarize(memory_hit),
+        "cache.disk_hit": summarize(disk_hit),
+    }
+
+
+def synthetic_series(points):
+    """PriceSeries e OHLCSeries com `points` pontos, terminando agora"""
+    import numpy as np
+    from gui.series import OHLCSeries, PriceSeries
+
+    rng = np.random.default_rng(points)
+    end_ms = time.time() * 1000
+    timestamps = end_ms - np.arange(points)[::-1] * 5 * 60 * 1000
+    prices = 50_000 * np.exp(np.cumsum(rng.normal(0, 0.002, points)))
+    volumes = rng.uniform(1e9, 5e9, points)
+    open_ = np.concatenate(([prices[0]], prices[:-1]))
+    spread = prices * rng.uniform(0, 0.01, points)
+    series = PriceSeries(timestamps, prices, prices * 19e6, volumes)
+    ohlc = OHLCSeries(timestamps, open_, np.maximum(open_, prices) + spread, np.minimum(open_, prices) - spread, prices)
+    return series, ohlc
+
+
+def bench_render(app, sizes, repeats):
+    """create_professional_chart (downsampling + artistas + desenho no Agg) por tamanho da série"""
+    results = {}
+    for points in sizes:
+        series, ohlc = synthetic_series(points)
+        price = {"usd": float(series.prices[-1])}
+        for kind, candles in (("line", None), ("candles", ohlc)):
+            app.create_professional_chart("bench", series, price, candles)  # aquecimento
+            samples = [timed(app.create_professional_chart, "bench", series, price, candles)[0] for _ in range(repeats)]
+            results[f"render.{kind}.{points}"] = summarize(samples)
+    return results
+
+
+def bench_history(db_path, rows, page_queries):
+    """Vazão de gravação do histórico e latência das leituras paginadas e dos resumos"""
+    from api.history_store import SearchHistoryStore
+
+    store = SearchHistoryStore(db_path)
+    coins = [f"coin-{i}" for i in range(50)]
+    started = time.perf_counter()
+    for i in range(rows):
+        store.add(coins[i % len(coins)], 100.0 + i % 997, 540.0 + i % 997, (i % 21) - 10.0)
+    enqueue_s = time.perf_counter() - started
+    store.flush()
+    total_s = time.perf_counter() - started
+
+    first_page = store.page(limit=200)
+    deep_key = (first_page[-1][2], first_page[-1][0])
+    page = [timed(store.page, None, deep_key, None, 200)[0] for _ in range(page_queries)]
+    filtered = [timed(store.page, coins[7], None, None, 200)[0] for _ in range(page_queries)]
+    daily = [timed(store.daily_stats, None, 30)[0] for _ in range(page_queries)]
+    store.close()
+    return {
+        "history.insert": {"unit": "rows/s", "value": round(rows / total_s), "rows": rows},
+        "history.enqueue": {"unit": "rows/s", "value": round(rows / enqueue_s), "rows": rows},
+        "history.page": summarize(page),
+        "history.page_filtered": summarize(filtered),
+        "history.daily_stats": summarize(daily),
+    }
+
+
+def metric_value(metric):
+    return metric["median"] if metric["unit"] == "ms" else metric["value"]
+
+
+def compare(results, baseline):
+    """Métricas piores que a base além do limite: [(nome, base, atual, variação)]"""
+    regressions = []
+    for name, metric in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or previous["unit"] != metric["unit"] or not metric_value(previous):
+            continue
+        change = metric_value(metric) / metric_value(previous) - 1
+        # Tempo maior é pior; vazão (rows/s) menor é pior
+        worse = change if metric["unit"] == "ms" else -change
+        if worse > REGRESSION_THRESHOLD:
+            regressions.append((name, metric_value(previous), metric_value(metric), change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do CryptoApp contra um stub da CoinGecko")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="resultados anteriores para comparar")
+    parser.add_argument("--latency-ms", type=float, default=50, help="atraso de cada resposta do stub")
+    parser.add_argument("--points", type=int, default=0, help="pontos por resposta do stub (0 = como a CoinGecko)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração das respostas do stub com HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After (s) dos 429 do stub")
+    parser.add_argument("--coins", type=int, default=5, help="moedas buscadas no benchmark de busca")
+    parser.add_argument("--history-rows", type=int, default=50_000)
+    parser.add_argument("--quick", action="store_true", help="menos repetições e séries menores")
+    args = parser.parse_args(argv)
+
+    from api import http_client
+    from api.cache import MemoryLRUCache, ResponseCache
+    from api.fetcher import CachedFetcher
+    from api.rate_limiter import rate_limiter
+    from api.timeseries import TimeSeriesStore
+
+    repeats = 3 if args.quick else 10
+    sizes = RENDER_POINTS[:3] if args.quick else RENDER_POINTS
+    history_rows = min(args.history_rows, 5_000) if args.quick else args.history_rows
+
+    config = StubConfig(args.latency_ms, args.points, args.error_rate, args.retry_after)
+    # O limitador da CoinGecko mediria a espera, não o app; os 429 do stub ainda valem
+    rate_limiter.configure(per_minute=1_000_000, burst=1_000)
+
+    with tempfile.TemporaryDirectory(prefix="cryptoapp-bench-") as tmp, CoinGeckoStub(config=config) as stub:
+        http_client.set_base_url(stub.url)
+
+        def fetcher_factory(response_cache=None):
+            return CachedFetcher(
+                memory_cache=MemoryLRUCache(),
+                response_cache=response_cache or ResponseCache(os.path.join(tmp, f"cache-{time.monotonic_ns()}.db")),
+            )
+
+        from api.history_store import SearchHistoryStore
+
+        fetcher = fetcher_factory()
+        history_store = SearchHistoryStore(os.path.join(tmp, "search_history.db"))
+        timeseries_store = TimeSeriesStore(os.path.join(tmp, "market_data.db"))
+        app = headless_app(fetcher, history_store, timeseries_store, *CHART_SIZE_PX)
+
+        results = {}
+        # Os avisos que o app imprime (ex.: "Dados OHLC não disponíveis") não entram na saída
+        with contextlib.redirect_stdout(io.StringIO()):
+            print("⏱️  Busca (stub)...", file=sys.stderr)
+            results.update(bench_search(app, [f"bench-coin-{i}" for i in range(args.coins)], repeats))
+            print("⏱️  Cache...", file=sys.stderr)
+            results.update(bench_cache(fetcher_factory, repeats * 10))
+            print("⏱️  Gráfico...", file=sys.stderr)
+            results.update(bench_render(app, sizes, repeats))
+            print("⏱️  Histórico SQLite...", file=sys.stderr)
+            results.update(bench_history(os.path.join(tmp, "history_bench.db"), history_rows, repeats * 5))
+
+        history_store.close()
+        fetcher.shutdown()
+        http_client.close()
+
+    report = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "stub": {**config.as_dict(), "requests": config.requests, "rate_limited": config.rate_limited},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    width = max(len(name) for name in results)
+    for name, metric in results.items():
+        print(f"{name:<{width}}  {metric_value(metric):>12,.3f} {metric['unit']}")
+    print(f"\nResultados em {args.output} ({config.requests} requisições ao stub, {config.rate_limited} com 429)")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("quick") != report["quick"] or baseline.get("stub", {}).get("latency_ms") != args.latency_ms:
+            print("⚠️  A base foi gerada com outras opções (--quick/--latency-ms); a comparação é aproximada")
+        regressions = compare(results, baseline)
+        for name, before, after, change in regressions:
+            print(f"❌ {name}: {before:,.3f} -> {after:,.3f} ({change:+.0%})")
+        if regressions:
+            return 1
+        print(f"✅ Nenhuma regressão acima de {REGRESSION_THRESHOLD:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""Servidor local que imita a CoinGecko para benchmarks e testes manuais.
+
+Uso: python tools/coingecko_stub.py [--port 8765] [--latency-ms 80] [--points 0] [--error-rate 0.0]
+
+Atende /simple/price, /coins/{id}/market_chart, /coins/{id}/market_chart/range e
+/coins/{id}/ohlc com séries sintéticas e determinísticas por moeda. Aponte o app para
+ele com COINGECKO_BASE_URL=http://127.0.0.1:8765 (ou `python main.py serve --upstream`).
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+# Início das séries para days=max
+MAX_HISTORY_DAYS = 365 * 5
+
+COIN_PATH = re.compile(r"^/coins/([a-z0-9-]+)/(market_chart|market_chart/range|ohlc)$")
+
+
+def market_chart_step_ms(span_ms):
+    """Granularidade automática da CoinGecko: 5 min até 1 dia, horária até 90 dias, diária acima"""
+    if span_ms <= DAY_MS:
+        return 5 * MINUTE_MS
+    if span_ms <= 90 * DAY_MS:
+        return HOUR_MS
+    return DAY_MS
+
+
+def ohlc_step_ms(days):
+    """Candles de 30 min (1-2 dias), 4 h (3-30 dias) ou 4 dias (acima de 30)"""
+    if days <= 2:
+        return 30 * MINUTE_MS
+    if days <= 30:
+        return 4 * HOUR_MS
+    return 4 * DAY_MS
+
+
+def parse_days(value):
+    return MAX_HISTORY_DAYS if value == "max" else max(float(value), 1 / 24)
+
+
+def coin_price(coin_id, timestamp_ms):
+    """Preço sintético: passeio determinístico por moeda, igual entre requisições"""
+    seed = zlib.crc32(coin_id.encode())
+    base = 10 ** (seed % 5) * (1 + seed % 97 / 10)
+    hours = timestamp_ms / HOUR_MS
+    wave = 0.15 * ((seed + int(hours // 24)) % 17 / 17 - 0.5) + 0.05 * ((int(hours) * 2654435761) % 1000 / 1000 - 0.5)
+    return round(base * (1 + wave), 6)
+
+
+class StubConfig:
+    """Parâmetros do stub, alteráveis durante a execução"""
+
+    def __init__(self, latency_ms=0, points=0, error_rate=0.0, retry_after=1, seed=0):
+        self.latency_ms = latency_ms
+        # 0 = granularidade da CoinGecko; N = exatamente N pontos/candles por resposta
+        self.points = points
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    def as_dict(self):
+        return {
+            "latency_ms": self.latency_ms,
+            "points": self.points,
+            "error_rate": self.error_rate,
+            "retry_after": self.retry_after,
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeçalho e corpo saem em escritas separadas; com Nagle, cada resposta numa
+    # conexão keep-alive esperaria o ACK atrasado do cliente (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        config = self.server.config
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+
+        with config.lock:
+            config.requests += 1
+            limited = config.error_rate > 0 and config.random.random() < config.error_rate
+            if limited:
+                config.rate_limited += 1
+        if config.latency_ms:
+            time.sleep(config.latency_ms / 1000)
+
+        if limited:
+            self.send_json(429, {"status": {"error_code": 429, "error_message": "rate limited"}},
+                           {"Retry-After": str(config.retry_after)})
+            return
+
+        try:
+            body = self.route(url.path.rstrip("/"), params, config)
+        except (KeyError, ValueError) as e:
+            self.send_json(400, {"error": f"parâmetro inválido: {e}"})
+            return
+        if body is None:
+            self.send_json(404, {"error": "coin not found"})
+            return
+        self.send_json(200, body)
+
+    def route(self, path, params, config):
+        if path == "/simple/price":
+            now_s = int(time.time())
+            return {coin_id: self.simple_price(coin_id, now_s) for coin_id in params["ids"].split(",") if coin_id}
+
+        match = COIN_PATH.match(path)
+        if match is None:
+            return None
+        coin_id, endpoint = match.groups()
+        now_ms = int(time.time() * 1000)
+
+        if endpoint == "ohlc":
+            days = parse_days(params["days"])
+            return self.ohlc(coin_id, now_ms - days * DAY_MS, now_ms, ohlc_step_ms(days), config.points)
+
+        if endpoint == "market_chart":
+            start_ms = now_ms - parse_days(params["days"]) * DAY_MS
+            end_ms = now_ms
+        else:
+            start_ms = float(params["from"]) * 1000
+            end_ms = min(float(params["to"]) * 1000, now_ms)
+        return self.market_chart(coin_id, start_ms, end_ms, config.points)
+
+    @staticmethod
+    def timestamps(start_ms, end_ms, step_ms, points):
+        if points:
+            step_ms = max((end_ms - start_ms) / points, 1)
+        first = int(start_ms // step_ms + 1) * step_ms
+        count = max(int((end_ms - first) // step_ms) + 1, 0)
+        return [int(first + i * step_ms) for i in range(count)]
+
+    def market_chart(self, coin_id, start_ms, end_ms, points):
+        stamps = self.timestamps(start_ms, end_ms, market_chart_step_ms(end_ms - start_ms), points)
+        prices = [[ts, coin_price(coin_id, ts)] for ts in stamps]
+        return {
+            "prices": prices,
+            "market_caps": [[ts, price * 19_000_000] for ts, price in prices],
+            "total_volumes": [[ts, price * 350_000] for ts, price in prices],
+        }
+
+    def ohlc(self, coin_id, start_ms, end_ms, step_ms, points):
+        candles = []
+        for ts in self.timestamps(start_ms, end_ms, step_ms, points):
+            open_, close = coin_price(coin_id, ts - step_ms), coin_price(coin_id, ts)
+            candles.append([ts, open_, max(open_, close) * 1.01, min(open_, close) * 0.99, close])
+        return candles
+
+    @staticmethod
+    def simple_price(coin_id, now_s):
+        usd = coin_price(coin_id, now_s * 1000)
+        return {
+            "usd": usd,
+            "brl": round(usd * 5.4, 6),
+            "usd_market_cap": usd * 19_000_000,
+            "usd_24h_vol": usd * 350_000,
+            "usd_24h_change": round((usd / coin_price(coin_id, (now_s - 86400) * 1000) - 1) * 100, 4),
+            "last_updated_at": now_s,
+        }
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class CoinGeckoStub:
+    """Stub HTTP numa thread de fundo; `url` serve como base da API"""
+
+    def __init__(self, host="127.0.0.1", port=0, config=None):
+        self.config = config or StubConfig()
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = self.config
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="coingecko-stub", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stub local da API da CoinGecko")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="atraso de cada resposta")
+    parser.add_argument("--points", type=int, default=0, help="pontos por resposta (0 = como a CoinGecko)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração das respostas com HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After (s) dos 429")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency_ms, args.points, args.error_rate, args.retry_after)
+    stub = CoinGeckoStub(args.host, args.port, config)
+    print(f"Stub da CoinGecko em {stub.url}", file=sys.stderr)
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.httpd.server_close()
+        print(f"{config.requests} requisições ({config.rate_limited} com 429)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
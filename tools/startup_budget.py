@@ -0,0 +1,90 @@
+"""Mede o custo de importação de main.py (python -X importtime) e falha se passar do orçamento.
+
+Uso: python tools/startup_budget.py [--budget-ms 150] [--runs 3] [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamento (ms) para importar main.py e mostrar a tela inicial
+DEFAULT_BUDGET_MS = 150
+
+# Módulos que só a tela de cotação usa e não podem ser carregados na inicialização
+DEFERRED_MODULES = ("matplotlib", "numpy", "requests", "seaborn", "pandas", "mplfinance", "gui.tela_cotacao")
+
+
+def parse_importtime(stderr):
+    """Linhas do -X importtime como {módulo: (próprio µs, acumulado µs)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        # Um módulo pode aparecer mais de uma vez; vale a primeira (a que de fato importou)
+        modules.setdefault(name, (int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure(code="import main"):
+    """Executa o código num processo novo e devolve os tempos de cada import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de inicialização do CryptoApp")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="execuções; vale a mais rápida")
+    parser.add_argument("--top", type=int, default=15, help="quantos módulos mais caros listar")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    # O que o próprio interpretador já carrega (site, .pth) não entra na conta
+    baseline = measure("pass")
+    runs = [measure() for _ in range(max(1, args.runs))]
+    best = min(runs, key=lambda modules: modules["main"][1])
+    best = {name: times for name, times in best.items() if name not in baseline}
+    total_ms = best["main"][1] / 1000
+    deferred = sorted(
+        name for name in best
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    )
+    top = sorted(best.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    ok = total_ms <= args.budget_ms and not deferred
+
+    if args.json:
+        print(json.dumps({
+            "total_ms": round(total_ms, 2),
+            "budget_ms": args.budget_ms,
+            "modules": len(best),
+            "deferred_loaded": deferred,
+            "top": [{"module": name, "self_ms": s / 1000, "cumulative_ms": c / 1000} for name, (s, c) in top],
+            "ok": ok,
+        }, indent=2))
+    else:
+        print(f"{'acumulado (ms)':>15} {'próprio (ms)':>13}  módulo")
+        for name, (self_us, cumulative_us) in top:
+            print(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>13.1f}  {name}")
+        print()
+        print(f"Total: {total_ms:.1f} ms de {args.budget_ms:.0f} ms ({len(best)} módulos)")
+        if deferred:
+            print("Módulos da tela de cotação carregados na inicialização: " + ", ".join(deferred))
+        print("✅ Dentro do orçamento" if ok else "❌ Fora do orçamento")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())